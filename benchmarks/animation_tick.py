@@ -0,0 +1,69 @@
+# Frames per second playing a grid of Animations, drawing every one each frame against drawing only the ones
+# PyGameControls.tick reports as changed
+# usage: python benchmarks/animation_tick.py [frames]
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import pygame
+import pygame_controls
+
+COLUMNS = 40
+ROWS = 25
+SIZE = 24
+FRAMES = 8
+
+
+def make_sheet(directory):
+    sheet = pygame.Surface((SIZE * FRAMES, SIZE), pygame.SRCALPHA)
+    for i in range(FRAMES):
+        pygame.draw.circle(sheet, (255, 32 * i, 0, 255), (i * SIZE + SIZE // 2, SIZE // 2), 2 + i)
+    file = os.path.join(directory, 'sheet.png')
+    pygame.image.save(sheet, file)
+    return file
+
+
+def frames_per_second(screen, file, only_changed, frames):
+    controls = pygame_controls.PyGameControls()
+    # start the animation clock at 0 before the animations are played, otherwise they're scheduled against
+    # pygame.time.get_ticks() and the clock below never reaches them
+    now = 0
+    controls.tick(now)
+    # frame times from 40 to 200 ms so animations change frame at different times
+    animations = [controls.create_animation(screen, {'sheet': file, 'frame_size': (SIZE, SIZE)},
+                                            x * SIZE, y * SIZE, frame_time=40 + (x * y) % 160)
+                  for y in range(ROWS) for x in range(COLUMNS)]
+    controls.draw_batch(animations)
+
+    drawn = 0
+    start = time.perf_counter()
+    for i in range(frames):
+        # a 60 Hz clock
+        now += 16
+        changed = controls.tick(now)
+        drawn += len(changed)
+        controls.draw_batch(changed if only_changed else animations)
+    return frames / (time.perf_counter() - start), drawn / float(frames)
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pygame.init()
+    screen = pygame.display.set_mode((COLUMNS * SIZE, ROWS * SIZE))
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = make_sheet(directory)
+        every, changed_per_frame = frames_per_second(screen, file, False, frames)
+        changed, changed_per_frame = frames_per_second(screen, file, True, frames)
+
+    print('%d animations, %.1f change frame every frame' % (COLUMNS * ROWS, changed_per_frame))
+    print('draw every animation:  %8.1f frames/sec' % every)
+    print('draw changed only:     %8.1f frames/sec' % changed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# Python memory taken by each Label, Picture, Font and ControlProperties, measured with tracemalloc
+# pixel data lives in SDL and isn't counted, the images, font files and properties are shared the way an
+# application would share them so only what each instance carries is left
+# pass the directory of another checkout (git worktree add ../before <commit>) to measure it instead
+# usage: python benchmarks/control_memory.py [controls] [directory of pygame_controls.py]
+import os
+import sys
+import tempfile
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.realpath(sys.argv[2]) if len(sys.argv) > 2 else
+                os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import pygame
+import pygame_controls
+from constants import *
+
+WIDTH = 120
+HEIGHT = 40
+
+
+def make_image(directory):
+    image = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    pygame.draw.circle(image, (20, 200, 60, 180), (WIDTH // 2, HEIGHT // 2), HEIGHT // 2)
+    file = os.path.join(directory, 'image.png')
+    pygame.image.save(image, file)
+    return file
+
+
+def measure(make, count):
+    # bytes per instance made by make(i), the first one is made before measuring so shared caches are filled
+    keep = [make(0)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    keep += [make(i) for i in range(1, count + 1)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return size / count, not hasattr(keep[-1], '__dict__')
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    controls = pygame_controls.PyGameControls()
+    font = controls.create_font(controls.default_font, 11, 'regular')
+    label_properties = pygame_controls.ControlProperties('label', text_color_normal=(0, 0, 0, 255))
+    picture_properties = pygame_controls.ControlProperties('picture')
+
+    print('%d instances, from %s' % (count, os.path.dirname(os.path.realpath(pygame_controls.__file__))))
+    with tempfile.TemporaryDirectory() as directory:
+        file = make_image(directory)
+        for name, make in (
+                ('Label', lambda i: controls.create_label(screen, 'Label text', 0, 0, WIDTH, HEIGHT,
+                                                          properties=label_properties, font=font)),
+                ('Picture', lambda i: controls.create_pic(screen, file, 0, 0, properties=picture_properties)),
+                ('Font', lambda i: controls.create_font(controls.default_font, 11, 'regular')),
+                ('ControlProperties', lambda i: pygame_controls.ControlProperties(
+                    'label', bk_color_normal=(i % 256, 0, 0, 255), bk_color_hot=(0, i % 256, 0, 255),
+                    text_color_normal=(255, 255, 255, 255), px_border=1,
+                    border_color_normal=(0, 0, i % 256, 255)))):
+            size, slotted = measure(make, count)
+            print('%-18s %8.0f bytes each%s' % (name + ':', size, '' if slotted else ', has a __dict__'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# A heatmap of columns x rows cells made of Labels and made of one ControlTable
+# time to create it, Python memory it takes (tracemalloc), time to draw all of it, time to disable a region of it
+# and redraw what changed, and time to find the cell under the mouse
+# usage: python benchmarks/control_table.py [columns] [rows]
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import pygame
+import pygame_controls
+from constants import *
+
+WIDTH = 24
+HEIGHT = 16
+COLORS = 8
+HITS = 1000
+
+
+def palette():
+    return [pygame_controls.ControlProperties('label', bk_color_normal=(255 * i // (COLORS - 1), 40,
+                                                                       255 - 255 * i // (COLORS - 1), 255),
+                                              bk_color_disabled=(90, 90, 90, 255),
+                                              text_color_normal=(255, 255, 255, 255))
+            for i in range(COLORS)]
+
+
+def value(i):
+    return (i * 7919) % 100
+
+
+def labels(controls, screen, columns, rows):
+    properties = palette()
+    font = controls.create_font(controls.default_font, 10, 'regular')
+    cells = []
+    for y in range(rows):
+        for x in range(columns):
+            i = y * columns + x
+            cells.append(controls.create_label(screen, value(i), x * WIDTH, y * HEIGHT, WIDTH, HEIGHT,
+                                               style=[TS_HCENTER], properties=properties[value(i) * COLORS // 100],
+                                               font=font, cache_states=True))
+    return cells
+
+
+def table(controls, screen, columns, rows):
+    count = columns * rows
+    font = controls.create_font(controls.default_font, 10, 'regular')
+    return controls.create_table(screen, pygame_controls.ControlTable.grid(0, 0, columns, rows, WIDTH, HEIGHT),
+                                 palette(), texts=[value(i) for i in range(count)],
+                                 colors=[value(i) * COLORS // 100 for i in range(count)], style=[TS_HCENTER],
+                                 font=font, background=(0, 0, 0))
+
+
+def measure(make):
+    tracemalloc.start()
+    start = time.perf_counter()
+    made = make()
+    seconds = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return made, seconds * 1000, size
+
+
+def main():
+    columns = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    pygame.init()
+    screen = pygame.display.set_mode((columns * WIDTH, rows * HEIGHT))
+    region = pygame.Rect(0, 0, columns * WIDTH // 2, rows * HEIGHT // 2)
+    points = [((i * 7907) % (columns * WIDTH), (i * 104729) % (rows * HEIGHT)) for i in range(HITS)]
+    print('%d x %d cells' % (columns, rows))
+
+    controls = pygame_controls.PyGameControls()
+    cells, create_ms, size = measure(lambda: labels(controls, screen, columns, rows))
+    controls.draw_batch(cells)
+    start = time.perf_counter()
+    controls.draw_batch(cells)
+    draw_ms = (time.perf_counter() - start) * 1000
+    dispatcher = controls.create_dispatcher()
+    for cell in cells:
+        dispatcher.add(cell)
+    start = time.perf_counter()
+    for cell in cells:
+        if cell.draw_rect.colliderect(region):
+            cell.state = STATE_DISABLED
+    controls.draw_batch(cells)
+    region_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for point in points:
+        dispatcher.control_at(point)
+    hit_us = (time.perf_counter() - start) * 1000000 / HITS
+    print('%-12s %8.1f ms create %8.1f MB %8.2f ms draw %8.2f ms disable region %8.2f us hit test'
+          % ('Labels:', create_ms, size / 1048576, draw_ms, region_ms, hit_us))
+    del cells, dispatcher
+
+    controls = pygame_controls.PyGameControls()
+    cells, create_ms, size = measure(lambda: table(controls, screen, columns, rows))
+    cells.draw()
+    start = time.perf_counter()
+    cells.draw()
+    draw_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    cells.set_state(cells.cells_in(region), STATE_DISABLED)
+    cells.update()
+    region_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for point in points:
+        cells.cell_at(point)
+    hit_us = (time.perf_counter() - start) * 1000000 / HITS
+    print('%-12s %8.1f ms create %8.1f MB %8.2f ms draw %8.2f ms disable region %8.2f us hit test'
+          % ('ControlTable:', create_ms, size / 1048576, draw_ms, region_ms, hit_us))
+
+
+if __name__ == '__main__':
+    main()
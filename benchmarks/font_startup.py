@@ -0,0 +1,46 @@
+# Compares PyGameControls construction with no font index (cold) against a populated index (warm)
+# usage: python benchmarks/font_startup.py [runs]
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import pygame_controls
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index_file = os.path.join(temp_dir, 'font_index.json')
+
+        def cold():
+            if os.path.isfile(index_file):
+                os.remove(index_file)
+            pygame_controls.PyGameControls(font_index_file=index_file)
+
+        def warm():
+            pygame_controls.PyGameControls(font_index_file=index_file)
+
+        def no_index():
+            pygame_controls.PyGameControls(font_index_file=None)
+
+        no_index_time = min(timeit.repeat(no_index, number=1, repeat=runs))
+        cold_time = min(timeit.repeat(cold, number=1, repeat=runs))
+        # leave an index behind for the warm runs
+        cold()
+        warm_time = min(timeit.repeat(warm, number=1, repeat=runs))
+
+        controls = pygame_controls.PyGameControls(font_index_file=index_file)
+        print('font files:       %d' % len(controls._font_files))
+        print('no index:         %.4fs' % no_index_time)
+        print('cold (new index): %.4fs' % cold_time)
+        print('warm (reused):    %.4fs' % warm_time)
+        if warm_time:
+            print('speedup:          %.1fx' % (cold_time / warm_time))
+
+
+if __name__ == '__main__':
+    main()
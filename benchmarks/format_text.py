@@ -0,0 +1,109 @@
+# Compares PyGameControls._format_text against the original prefix re-measuring wrap loop
+# 'lines' text has a newline every 20 words or so, 'paragraph' text is one long line wrapped over and over
+# usage: python benchmarks/format_text.py [font file]
+import os
+import sys
+import random
+import timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import pygame
+import pygame_controls
+from constants import *
+
+
+def reference_wrap(text, pygame_font, rect, style, wrap_at_letter=True):
+    # the wrap loop _format_text used before glyph metrics, measures every prefix of the line
+    text = text.replace('\t', '')
+    new_string = ''
+    for line in text.splitlines():
+        if line == '':
+            new_string += '\n'
+            continue
+        while line:
+            amps = []
+            if TS_NOPREFIX not in style:
+                while line.find('&') != -1:
+                    index = line.find('&')
+                    amps.append(index)
+                    line = line[:index] + line[index + 1:]
+
+            if TS_LEFTNOWORDWRAP not in style:
+                char_index = 0
+                line_size = pygame_font.size(line[:char_index])[0]
+                while line_size <= rect.width and char_index < len(line):
+                    char_index += 1
+                    line_size = pygame_font.size(line[:char_index])[0]
+
+                if len(amps):
+                    for amp in reversed(amps):
+                        if amp < char_index:
+                            char_index += 1
+                        line = line[:amp] + '&' + line[amp:]
+
+                if char_index < len(line) or line_size > rect.width:
+                    j = line.rfind(' ', 0, char_index) + 1
+                    if j == 0:
+                        if TS_MULTILINE in style or wrap_at_letter:
+                            if line_size > rect.width:
+                                char_index -= 1
+                        else:
+                            char_index = len(line)
+                    else:
+                        if TS_WORDELLIPSIS not in style:
+                            char_index = j
+                        else:
+                            char_index = j - 1
+                            line = line[:char_index] + line[char_index + 1:]
+                else:
+                    if TS_MULTILINE in style or wrap_at_letter:
+                        if line_size > rect.width:
+                            char_index -= 1
+                    else:
+                        char_index = line.find(' ', char_index)
+                        if char_index == -1:
+                            char_index = len(line)
+            else:
+                char_index = len(line)
+
+            new_string += line[:char_index] + '\n'
+            line = line[char_index:]
+    return new_string[:-1]
+
+
+def make_text(size, newlines=True):
+    random.seed(size)
+    words = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit', 'sed', 'do',
+             'eiusmod', 'tempor', 'AVAVAV', 'Wally', 'supercalifragilisticexpialidocious', '&file', '12:00']
+    text = ''
+    while len(text) < size:
+        text += random.choice(words) + (' ' if not newlines or random.random() > 0.05 else '\n')
+    return text[:size]
+
+
+def main():
+    pygame.init()
+    controls = pygame_controls.PyGameControls()
+    font_file = sys.argv[1] if len(sys.argv) > 1 else controls.default_font_file
+    font = pygame.font.Font(font_file, 14)
+    rect = pygame.Rect(0, 0, 300, 200)
+    style = [TS_LEFT, TS_TOP, TS_MULTILINE]
+
+    print('%-10s %8s %12s %12s %8s %s' % ('text', 'size', 'reference', 'metrics', 'speedup', 'output'))
+    for name, newlines, size in (('lines', True, 1024), ('lines', True, 10 * 1024), ('lines', True, 100 * 1024),
+                                 ('paragraph', False, 5 * 1024), ('paragraph', False, 20 * 1024),
+                                 ('paragraph', False, 80 * 1024)):
+        text = make_text(size, newlines)
+        expected = reference_wrap(text, font, rect, style)
+        result = controls._format_text(text, font, rect, style)
+        runs = 3
+        reference_time = min(timeit.repeat(lambda: reference_wrap(text, font, rect, style), number=1, repeat=runs))
+        metrics_time = min(timeit.repeat(lambda: controls._format_text(text, font, rect, style), number=1, repeat=runs))
+        print('%-10s %8d %11.4fs %11.4fs %7.1fx %s' % (name, size, reference_time, metrics_time, reference_time / metrics_time,
+                                                 'same' if expected == result else 'DIFFERENT'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# Compares Labels drawn with the glyph atlas text renderer against the line renderer,
+# a pixel diff of the output and the time taken by labels that change every frame
+# usage: python benchmarks/glyph_atlas.py [font size]
+import os
+import sys
+import timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import pygame
+import pygame_controls
+from constants import *
+
+# largest difference in a color channel before a pixel counts as different
+TOLERANCE = 48
+# glyphs may sit a pixel away from where SDL_ttf puts them (sub-pixel advances), so a pixel matches if any
+# pixel within SHIFT pixels horizontally matches
+SHIFT = 1
+# share of pixels allowed to be different
+MAX_DIFFERENT = 0.01
+
+
+def same_pixel(a, b):
+    return max(abs(a[i] - b[i]) for i in range(4)) <= TOLERANCE
+
+
+def pixel_diff(a, b):
+    width, height = a.get_size()
+    different = 0
+    for y in range(height):
+        for x in range(width):
+            pixel = a.get_at((x, y))
+            if not any(same_pixel(pixel, b.get_at((nx, y)))
+                       for nx in range(max(x - SHIFT, 0), min(x + SHIFT + 1, width))):
+                different += 1
+    return different / float(width * height or 1)
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((400, 60))
+    font_size = int(sys.argv[1]) if len(sys.argv) > 1 else 14
+    controls = pygame_controls.PyGameControls()
+    font = controls.create_font(controls.default_font, font_size, 'regular')
+    properties = pygame_controls.ControlProperties('label', 'flat', bk_color_normal=(240, 240, 240, 255),
+                                                   text_color_normal=(20, 40, 60, 200))
+    style = [TS_LEFT, TS_TOP, TS_MULTILINE]
+    line_label = controls.create_label(screen, '', 0, 0, 400, 60, style, properties, font, 'line')
+    atlas_label = controls.create_label(screen, '', 0, 0, 400, 60, style, properties, font, 'atlas')
+
+    worst = 0
+    for text in ('0123456789', 'FPS: 59.94', 'x=1024 y=768', '12:34:56.789', 'Temperature 21.5 C', '&File &Edit'):
+        images = []
+        for label in (line_label, atlas_label):
+            screen.fill((0, 0, 0))
+            label.text = text
+            label.draw()
+            images.append(screen.copy())
+        worst = max(worst, pixel_diff(images[0], images[1]))
+    print('worst pixel diff: %.2f%% (%s)' % (worst * 100, 'pass' if worst <= MAX_DIFFERENT else 'FAIL'))
+
+    frames = ['%08.3f' % (i * 0.017) for i in range(2000)]
+
+    def run(label):
+        for text in frames:
+            label.text = text
+            label.draw()
+
+    line_time = min(timeit.repeat(lambda: run(line_label), number=1, repeat=3))
+    atlas_time = min(timeit.repeat(lambda: run(atlas_label), number=1, repeat=3))
+    print('line renderer:  %.4fs for %d counter updates' % (line_time, len(frames)))
+    print('atlas renderer: %.4fs for %d counter updates' % (atlas_time, len(frames)))
+    print('atlas stats:', controls.glyph_atlas.stats)
+
+
+if __name__ == '__main__':
+    main()
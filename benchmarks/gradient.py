@@ -0,0 +1,62 @@
+# Time to draw a grid of gradient buttons flipping between normal and hot, with and without the gradient cache,
+# and to build one gradient with numpy against the line by line fallback
+# usage: python benchmarks/gradient.py [frames]
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import pygame
+import pygame_controls
+from constants import *
+
+COLUMNS = 10
+ROWS = 20
+WIDTH = 96
+HEIGHT = 30
+
+
+def frames_per_second(screen, cache_bytes, frames):
+    controls = pygame_controls.PyGameControls(gradient_cache_bytes=cache_bytes)
+    properties = pygame_controls.ControlProperties('label', 'gradient',
+                                                   bk_color_normal=(40, 80, 160, 255),
+                                                   bk_color_hot=(60, 120, 220, 255))
+    labels = [controls.create_label(screen, 'OK', x * WIDTH, y * HEIGHT, WIDTH, HEIGHT, properties=properties)
+              for y in range(ROWS) for x in range(COLUMNS)]
+
+    start = time.perf_counter()
+    for i in range(frames):
+        for label in labels:
+            label.state = STATE_HOT if i % 2 else STATE_NORMAL
+        controls.draw_batch(labels)
+    return frames / (time.perf_counter() - start)
+
+
+def gradient_ms(numpy, count=20):
+    saved = pygame_controls.numpy
+    pygame_controls.numpy = numpy
+    stops = ((0.0, (255, 255, 255, 255)), (0.5, (40, 80, 160, 255)), (1.0, (0, 0, 0, 255)))
+    start = time.perf_counter()
+    for i in range(count):
+        pygame_controls.PyGameControls._make_gradient((WIDTH * 4, HEIGHT * 4), stops, 'radial', 0)
+    pygame_controls.numpy = saved
+    return (time.perf_counter() - start) * 1000 / count
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    pygame.init()
+    screen = pygame.display.set_mode((COLUMNS * WIDTH, ROWS * HEIGHT))
+
+    print('%d buttons flipping state every frame' % (COLUMNS * ROWS))
+    print('no cache:       %8.1f frames/sec' % frames_per_second(screen, 0, frames))
+    print('gradient cache: %8.1f frames/sec' % frames_per_second(screen, 4 * 1024 * 1024, frames))
+    if pygame_controls.numpy:
+        print('%dx%d radial gradient, numpy:    %8.2f ms' % (WIDTH * 4, HEIGHT * 4, gradient_ms(pygame_controls.numpy)))
+    print('%dx%d radial gradient, fallback: %8.2f ms' % (WIDTH * 4, HEIGHT * 4, gradient_ms(None)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Frames per second drawing a grid of Pictures with and without converting them to the display pixel format
+# usage: python benchmarks/picture_blit.py [frames] [display depth]
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import pygame
+import pygame_controls
+
+COLUMNS = 40
+ROWS = 30
+SIZE = 24
+
+
+def make_images(directory):
+    # a 24 bit image and one with per pixel alpha, the formats image files usually come in
+    opaque = pygame.Surface((SIZE, SIZE), depth=24)
+    opaque.fill((200, 120, 40))
+    pygame.draw.circle(opaque, (20, 60, 200), (SIZE // 2, SIZE // 2), SIZE // 3)
+    alpha = pygame.Surface((SIZE, SIZE), pygame.SRCALPHA)
+    pygame.draw.circle(alpha, (20, 200, 60, 180), (SIZE // 2, SIZE // 2), SIZE // 2)
+
+    files = [os.path.join(directory, 'opaque.bmp'), os.path.join(directory, 'alpha.png')]
+    pygame.image.save(opaque, files[0])
+    pygame.image.save(alpha, files[1])
+    return files
+
+
+def frames_per_second(screen, files, convert, frames):
+    controls = pygame_controls.PyGameControls(convert_images=convert)
+    pictures = [controls.create_pic(screen, files[(x + y) % 2], x * SIZE, y * SIZE)
+                for y in range(ROWS) for x in range(COLUMNS)]
+    # build the surfaces once, only the blits are timed
+    controls.draw_batch(pictures)
+
+    start = time.perf_counter()
+    for i in range(frames):
+        screen.fill((0, 0, 0))
+        controls.draw_batch(pictures)
+    return frames / (time.perf_counter() - start)
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    pygame.init()
+    screen = pygame.display.set_mode((COLUMNS * SIZE, ROWS * SIZE), depth=depth)
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = make_images(directory)
+        before = frames_per_second(screen, files, False, frames)
+        after = frames_per_second(screen, files, True, frames)
+
+    print('%d pictures, display depth %d' % (COLUMNS * ROWS, screen.get_bitsize()))
+    print('not converted: %8.1f frames/sec' % before)
+    print('converted:     %8.1f frames/sec' % after)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# Time spent resizing stretched (IMS_REALSIZECONTROL) Pictures between a few sizes, as a window resize would,
+# with and without the scaled image cache
+# usage: python benchmarks/picture_resize.py [resizes] [smooth 0/1]
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import pygame
+import pygame_controls
+from constants import *
+
+PICTURES = 200
+IMAGE_SIZE = 256
+SIZES = [(64, 64), (96, 72), (128, 128), (48, 48), (160, 120)]
+
+
+def make_image(directory):
+    image = pygame.Surface((IMAGE_SIZE, IMAGE_SIZE), pygame.SRCALPHA)
+    image.fill((200, 120, 40))
+    pygame.draw.circle(image, (20, 60, 200, 200), (IMAGE_SIZE // 2, IMAGE_SIZE // 2), IMAGE_SIZE // 3)
+    file = os.path.join(directory, 'image.png')
+    pygame.image.save(image, file)
+    return file
+
+
+def seconds(screen, file, cache_bytes, smooth, resizes):
+    controls = pygame_controls.PyGameControls(scaled_image_cache_bytes=cache_bytes, smooth_scale=smooth)
+    pictures = [controls.create_pic(screen, file, 0, 0, 64, 64, style=[IMS_REALSIZECONTROL])
+                for i in range(PICTURES)]
+
+    start = time.perf_counter()
+    for i in range(resizes):
+        width, height = SIZES[i % len(SIZES)]
+        for picture in pictures:
+            picture.move_surface(0, 0, width, height)
+    return time.perf_counter() - start
+
+
+def main():
+    resizes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    smooth = bool(int(sys.argv[2])) if len(sys.argv) > 2 else False
+    pygame.init()
+    screen = pygame.display.set_mode((640, 480))
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = make_image(directory)
+        before = seconds(screen, file, 0, smooth, resizes)
+        after = seconds(screen, file, 16 * 1024 * 1024, smooth, resizes)
+
+    print('%d pictures resized %d times, %s scaling' % (PICTURES, resizes, 'smooth' if smooth else 'fast'))
+    print('no cache:     %8.3f sec' % before)
+    print('scaled cache: %8.3f sec' % after)
+
+
+if __name__ == '__main__':
+    main()
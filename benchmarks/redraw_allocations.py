@@ -0,0 +1,90 @@
+# Surfaces allocated and time taken redrawing Labels and Pictures that change state every frame, with the text
+# cache, without it and with the controls caching the surface of each state
+# pygame.Surface is swapped for a subclass counting how many get made while redrawing
+# usage: python benchmarks/redraw_allocations.py [frames]
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import pygame
+import pygame_controls
+from constants import *
+
+COLUMNS = 6
+ROWS = 12
+WIDTH = 160
+HEIGHT = 60
+TEXT = 'Some text long enough to wrap onto a few lines'
+
+
+class CountingSurface(pygame.Surface):
+    count = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingSurface.count += 1
+        super().__init__(*args, **kwargs)
+
+
+def make_image(directory):
+    image = pygame.Surface((WIDTH // 2, HEIGHT // 2), pygame.SRCALPHA)
+    pygame.draw.circle(image, (20, 200, 60, 180), (WIDTH // 4, HEIGHT // 4), HEIGHT // 4)
+    file = os.path.join(directory, 'image.png')
+    pygame.image.save(image, file)
+    return file
+
+
+def redraw(screen, file, text_cache_bytes, cache_states, frames):
+    controls = pygame_controls.PyGameControls(text_cache_bytes=text_cache_bytes)
+    properties = pygame_controls.ControlProperties('label', bk_color_normal=(40, 80, 160, 200),
+                                                   bk_color_hot=(60, 120, 220, 255),
+                                                   text_color_normal=(255, 255, 255, 220))
+    picture_properties = pygame_controls.ControlProperties('picture', bk_color_normal=(40, 80, 160, 200),
+                                                           bk_color_hot=(60, 120, 220, 255))
+    controls_to_draw = []
+    for y in range(ROWS):
+        for x in range(COLUMNS):
+            if (x + y) % 2:
+                controls_to_draw.append(controls.create_label(screen, TEXT, x * WIDTH, y * HEIGHT, WIDTH, HEIGHT,
+                                                              style=[TS_MULTILINE], properties=properties,
+                                                              cache_states=cache_states))
+            else:
+                controls_to_draw.append(controls.create_pic(screen, file, x * WIDTH, y * HEIGHT, WIDTH, HEIGHT,
+                                                            properties=picture_properties,
+                                                            cache_states=cache_states))
+    controls.draw_batch(controls_to_draw)
+
+    CountingSurface.count = 0
+    pygame.Surface = CountingSurface
+    try:
+        start = time.perf_counter()
+        for i in range(frames):
+            for control in controls_to_draw:
+                control.state = STATE_HOT if i % 2 == 0 else STATE_NORMAL
+            controls.draw_batch(controls_to_draw)
+        seconds = time.perf_counter() - start
+    finally:
+        pygame.Surface = CountingSurface.__bases__[0]
+    return CountingSurface.count / frames, seconds * 1000 / frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    pygame.init()
+    screen = pygame.display.set_mode((COLUMNS * WIDTH, ROWS * HEIGHT))
+
+    print('%d controls changing state every frame' % (COLUMNS * ROWS))
+    with tempfile.TemporaryDirectory() as directory:
+        file = make_image(directory)
+        for text_cache_bytes, cache_states, name in ((8 * 1024 * 1024, False, 'text cache'),
+                                                     (0, False, 'no text cache'),
+                                                     (8 * 1024 * 1024, True, 'state cache')):
+            surfaces, ms = redraw(screen, file, text_cache_bytes, cache_states, frames)
+            print('%-14s %6.1f surfaces/frame %8.2f ms/frame' % (name + ':', surfaces, ms))
+
+
+if __name__ == '__main__':
+    main()
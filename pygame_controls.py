@@ -1,42 +1,205 @@
 import pygame
 import datetime
 import os
-import copy
 import glob
+import json
+import threading
+import weakref
+import collections
+import concurrent.futures
+import heapq
+import re
+import tempfile
 from constants import *
-from PIL import ImageFont
+from PIL import Image, ImageFont, ImageSequence
 
 if os.name != 'nt':
     import subprocess
 
+# numpy builds gradients a whole surface at a time, without it they're drawn a line at a time
+# ControlTable keeps its cells in numpy arrays and needs it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 OpenType_extensions = frozenset(('.ttf', '.ttc', '.otf'))
 SUPPORTED_CONTROLS = frozenset(('label', 'button', 'picture', 'animation'))
 SUPPORTED_CONTROL_STYLES = frozenset(('flat', 'gradient'))
+SUPPORTED_GRADIENTS = frozenset(('linear', 'radial'))
+# pygame mouse button -> (button down, button up, double click) PyGameControl events
+MOUSE_BUTTON_EVENTS = {1: (PGCE_LBUTTONDOWN, PGCE_LBUTTONUP, PGCE_LBUTTONDBLCLK),
+                       2: (PGCE_MBUTTONDOWN, PGCE_MBUTTONUP, PGCE_MBUTTONDBLCLK),
+                       3: (PGCE_RBUTTONDOWN, PGCE_RBUTTONUP, PGCE_RBUTTONDBLCLK)}
+# 'line' renders every line with pygame.font, 'atlas' builds lines out of glyphs cached in a GlyphAtlas
+SUPPORTED_TEXT_RENDERERS = frozenset(('line', 'atlas'))
 SUPPORTED_ATTRIBUTES = frozenset(('oblique', 'condensed', 'extralight',
                                   'semibold', 'semilight', 'italic', 'bold',
                                   'light', 'black', 'book', 'condensed bold',
                                   'semibold italic', 'semilight italic',
                                   'bold italic', 'black italic', 'light italic'))
+# font files are indexed by path, mtime and size so later startups don't have to open every font again
+FONT_INDEX_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'pygame_controls', 'font_index.json')
+FONT_INDEX_VERSION = 1
 
 
 class PyGameControls(object):
-    def __init__(self):
+    def __init__(self, font_index_file=FONT_INDEX_FILE, lazy_fonts=False, layout_cache_size=256,
+                 text_cache_bytes=8 * 1024 * 1024, text_renderer='line', image_cache_bytes=32 * 1024 * 1024,
+                 convert_images=True, image_workers=4, scaled_image_cache_bytes=16 * 1024 * 1024,
+                 smooth_scale=False, gradient_cache_bytes=4 * 1024 * 1024, state_cache_bytes=16 * 1024 * 1024,
+                 overlay_cache_bytes=4 * 1024 * 1024, atlas_cache_bytes=8 * 1024 * 1024):
         self._default_font = ''
         self._default_font_key = ''
         self._default_attribute = ['regular']
         self._default_font_file = ''
+        self._font_index_file = font_index_file
+        self._font_index = self.__load_font_index()
+        self._font_index_changed = False
+        self._font_lock = threading.RLock()
+        # font files that haven't been opened yet when lazy_fonts is used
+        self._pending_font_files = []
+        self._font_warm_up = None
+        self._font_pool = FontPool()
+        self._glyph_metrics = weakref.WeakKeyDictionary()
+        self._layout_cache = LRUCache(layout_cache_size)
+        self._text_cache = LRUCache(None, text_cache_bytes, surface_bytes)
+        self._glyph_atlas = GlyphAtlas(max_bytes=atlas_cache_bytes)
+        # convert images to the display's pixel format so they don't have to be converted on every blit
+        self._convert_images = convert_images
+        self._image_cache = ImageCache(image_cache_bytes, convert_images)
+        # thread pool decoding images for pictures created with async_load, started on first use
+        self._image_workers = max(int(image_workers), 1)
+        self._image_executor = None
+        # images stretched for IMS_REALSIZECONTROL pictures
+        self._scaled_images = ScaledImageCache(scaled_image_cache_bytes, smooth_scale)
+        # gradient backgrounds, (size, stops, type, angle) -> surface, shared by every control drawing the same one
+        self._gradient_cache = LRUCache(None, gradient_cache_bytes, surface_bytes)
+        # borders and etched frames drawn by draw_style, (size, frame style, px_border, border color) -> surface
+        self._overlay_cache = LRUCache(None, overlay_cache_bytes, surface_bytes)
+        # ControlProperties values -> the one instance every control with those values uses
+        self._interned_properties = weakref.WeakValueDictionary()
+        # surfaces of controls created with cache_states, (control token, control serial, state) -> surface
+        self._state_cache = LRUCache(None, state_cache_bytes, surface_bytes)
+        self._control_tokens = 0
+        # playing Animations as a heap of (time of the next frame, sequence, weakref to the Animation, serial),
+        # advanced by tick, entries whose serial doesn't match the Animation's any more are dropped
+        self._animations = []
+        self._animation_sequence = 0
+        self._animation_time = None
+        # decoded GIFs, (path, mtime) -> FrameBuffer, shared by every Animation playing the same file
+        self._frame_buffers = weakref.WeakValueDictionary()
+        # EventDispatchers (anything with a _control_moved method) told when a control moves or changes state
+        self._control_listeners = weakref.WeakSet()
+        self._text_renderer = 'line'
+        self.text_renderer = text_renderer
+        self._fonts = dict()
         self._font_files = self.__font_list()
-        self._fonts = self.__init_fonts()
+        self.__init_fonts(lazy_fonts)
+
+        if self._pending_font_files:
+            # fill in the rest of the fonts in the background
+            self._font_warm_up = threading.Thread(target=self.__warm_up_fonts, name='pygame_controls font warm-up')
+            self._font_warm_up.daemon = True
+            self._font_warm_up.start()
+        else:
+            self.__save_font_index()
 
-    def create_label(self, surface, text, x, y, width=None, height=None, style=None, properties=None, font=None):
-        return Label(self, surface, text, x, y, width, height, style, properties, font)
+    def create_label(self, surface, text, x, y, width=None, height=None, style=None, properties=None, font=None,
+                     text_renderer=None, cache_states=False):
+        return Label(self, surface, text, x, y, width, height, style, properties, font, text_renderer, cache_states)
 
-    def create_pic(self, surface, file, x, y, width=None, height=None, style=None, properties=None):
-        return Picture(self, surface, file, x, y, width, height, style, properties)
+    def create_pic(self, surface, file, x, y, width=None, height=None, style=None, properties=None,
+                   async_load=False, cache_states=False):
+        return Picture(self, surface, file, x, y, width, height, style, properties, async_load, cache_states)
+
+    def create_animation(self, surface, frames, x, y, width=None, height=None, style=None, properties=None,
+                         frame_time=100, loop=True, playing=True):
+        return Animation(self, surface, frames, x, y, width, height, style, properties, frame_time, loop, playing)
+
+    def frame_buffer(self, frames):
+        # FrameBuffer for frames, GIFs are decoded once and shared
+        if isinstance(frames, str) and frames.lower().endswith('.gif'):
+            try:
+                key = (frames, os.stat(frames).st_mtime_ns)
+            except OSError:
+                key = None
+            if key:
+                frame_buffer = self._frame_buffers.get(key)
+                if not frame_buffer:
+                    frame_buffer = self._frame_buffers[key] = FrameBuffer(self._image_cache, frames)
+                return frame_buffer
+        return FrameBuffer(self._image_cache, frames)
+
+    def tick(self, now=None):
+        # advances every playing Animation whose next frame is due and returns the ones that changed frame,
+        # the only ones that need drawing again
+        # now is in milliseconds, pygame.time.get_ticks() by default, pass the same clock every time
+        # until the first tick Animations are scheduled with pygame.time.get_ticks(), when tick is given a clock
+        # of its own call tick with it once before playing any
+        if now is None:
+            now = pygame.time.get_ticks()
+        self._animation_time = now
+
+        changed = []
+        animations = self._animations
+        while animations and animations[0][0] <= now:
+            due, sequence, ref, serial = heapq.heappop(animations)
+            animation = ref()
+            if animation and animation._advance(due, now, serial):
+                changed.append(animation)
+        return changed
+
+    def _now(self):
+        # the animation clock, the last time given to tick
+        return self._animation_time if self._animation_time is not None else pygame.time.get_ticks()
+
+    def _schedule_animation(self, animation, due, serial):
+        self._animation_sequence += 1
+        heapq.heappush(self._animations, (due, self._animation_sequence, weakref.ref(animation), serial))
+
+    def load_image_async(self, path):
+        # future of ImageCache.load(path) run on the image thread pool, its result goes to ImageCache.acquire on
+        # the thread drawing, which converts it to the display's pixel format
+        if not self._image_executor:
+            self._image_executor = concurrent.futures.ThreadPoolExecutor(self._image_workers,
+                                                                         'pygame_controls image')
+        return self._image_executor.submit(self._image_cache.load, path)
 
     def create_font(self, family_name, size, attribute):
         return Font(self, family_name, size, attribute)
 
+    def create_group(self, surface, background=None):
+        return ControlGroup(self, surface, background)
+
+    def create_table(self, surface, rects, properties, texts=None, colors=None, images=None, style=None, font=None,
+                     background=None):
+        return ControlTable(self, surface, rects, properties, texts, colors, images, style, font, background)
+
+    def create_dispatcher(self, cell_size=64):
+        return EventDispatcher(self, cell_size)
+
+    def _control_moved(self, control):
+        for listener in self._control_listeners:
+            listener._control_moved(control)
+
+    @staticmethod
+    def draw_batch(controls):
+        # draws many controls with one Surface.blits call per target surface instead of a blit per control
+        # controls are drawn in order, so later controls end up on top
+        batches = dict()
+        for control in controls:
+            prepared = control.prepare()
+            if prepared:
+                surface = control.surface
+                batch = batches.get(surface)
+                if batch is None:
+                    batch = batches[surface] = []
+                batch.append(prepared)
+
+        for surface, batch in batches.items():
+            surface.blits(batch, False)
+
     def add_font(self, font):
         if not isinstance(font, str) or not os.path.isfile(font):
             return False
@@ -44,18 +207,202 @@ class PyGameControls(object):
         if font in self._font_files:
             return True
 
-        f = ImageFont.truetype(font)
-        family_lower = f.font.family.lower()
-        style_lower = f.font.style.lower()
+        with self._font_lock:
+            family, style = self.__font_info(font)
+            family_lower = family.lower()
+            style_lower = style.lower()
 
-        if family_lower in self._fonts:
-            if style_lower in self._fonts[family_lower] and not os.path.isfile(self._fonts[family_lower][style_lower]):
-                self._fonts[family_lower].update({style_lower: font})
-        else:
-            self._fonts[family_lower] = {'family': f.font.family, style_lower: font}
-        del f
+            if family_lower in self._fonts:
+                if style_lower in self._fonts[family_lower] \
+                        and not os.path.isfile(self._fonts[family_lower][style_lower]):
+                    self._fonts[family_lower].update({style_lower: font})
+            else:
+                self._fonts[family_lower] = {'family': family, style_lower: font}
+            if not self._pending_font_files:
+                self.__save_font_index()
         return True
 
+    def wait_for_fonts(self, timeout=None):
+        # blocks until the background font warm-up started by lazy_fonts has finished
+        if self._font_warm_up:
+            self._font_warm_up.join(timeout)
+        return not self._pending_font_files
+
+    @property
+    def font_pool(self):
+        return self._font_pool
+
+    @property
+    def layout_cache(self):
+        return self._layout_cache
+
+    @property
+    def text_cache(self):
+        return self._text_cache
+
+    @property
+    def glyph_atlas(self):
+        return self._glyph_atlas
+
+    @property
+    def image_cache(self):
+        return self._image_cache
+
+    @property
+    def convert_images(self):
+        return self._convert_images
+
+    @property
+    def scaled_images(self):
+        return self._scaled_images
+
+    @property
+    def gradient_cache(self):
+        return self._gradient_cache
+
+    @property
+    def state_cache(self):
+        return self._state_cache
+
+    @property
+    def overlay_cache(self):
+        return self._overlay_cache
+
+    def intern_properties(self, properties):
+        # the instance of ControlProperties equal to properties shared by every control using it
+        interned = self._interned_properties.get(properties._key)
+        if interned is None:
+            self._interned_properties[properties._key] = interned = properties
+        return interned
+
+    def create_properties(self, control_type, style='flat', **properties):
+        return self.intern_properties(ControlProperties(control_type, style, **properties))
+
+    def _control_token(self):
+        # number identifying a control in the state cache, unlike id() never reused
+        self._control_tokens += 1
+        return self._control_tokens
+
+    def gradient(self, size, stops, gradient_type='linear', angle=90):
+        # surface of size filled with a gradient through stops, ((position 0.0 - 1.0, rgba), ...)
+        # linear gradients run along angle in degrees, 0 left to right, 90 top to bottom
+        # radial gradients run from the center out to the edges
+        # the surface is shared, don't draw on it
+        size = (int(size[0]), int(size[1]))
+        key = (size, stops, gradient_type, angle)
+        surface = self._gradient_cache.get(key)
+        if not surface:
+            surface = self._make_gradient(size, stops, gradient_type, angle)
+            self._gradient_cache.put(key, surface)
+        return surface
+
+    @staticmethod
+    def _make_gradient(size, stops, gradient_type, angle):
+        width, height = size
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        if not width or not height:
+            return surface
+
+        if numpy:
+            # position along the gradient of every pixel, 0.0 - 1.0
+            x = (numpy.arange(width) + 0.5)[:, None]
+            y = (numpy.arange(height) + 0.5)[None, :]
+            if gradient_type == 'radial':
+                t = numpy.minimum(numpy.hypot((x - width / 2) / (width / 2), (y - height / 2) / (height / 2)), 1.0)
+            else:
+                radians = numpy.radians(angle)
+                t = x * numpy.cos(radians) + y * numpy.sin(radians)
+                t = t - t.min()
+                t = t / (t.max() or 1.0)
+
+            positions = [stop[0] for stop in stops]
+            rgb = pygame.surfarray.pixels3d(surface)
+            for channel in range(3):
+                rgb[..., channel] = numpy.interp(t, positions, [stop[1][channel] for stop in stops]) + 0.5
+            del rgb
+            alpha = pygame.surfarray.pixels_alpha(surface)
+            alpha[...] = numpy.interp(t, positions, [stop[1][3] for stop in stops]) + 0.5
+            del alpha
+        elif gradient_type == 'radial':
+            # ellipses from the edges in, each one covering the ones before it
+            surface.fill(stops[-1][1])
+            steps = max(width, height) // 2 + 1
+            for i in range(steps, 0, -1):
+                rect = pygame.Rect(0, 0, max(width * i // steps, 1), max(height * i // steps, 1))
+                rect.center = (width // 2, height // 2)
+                pygame.draw.ellipse(surface, PyGameControls._gradient_color(stops, i / steps), rect)
+        else:
+            # the closest of left to right, top to bottom, right to left, bottom to top
+            direction = int(((angle % 360) + 45) // 90) % 4
+            length = height if direction % 2 else width
+            for i in range(length):
+                color = PyGameControls._gradient_color(stops, (i + 0.5) / length)
+                position = i if direction < 2 else length - 1 - i
+                if direction % 2:
+                    pygame.draw.line(surface, color, (0, position), (width - 1, position))
+                else:
+                    pygame.draw.line(surface, color, (position, 0), (position, height - 1))
+        return surface
+
+    @staticmethod
+    def _gradient_color(stops, t):
+        if t <= stops[0][0]:
+            return stops[0][1]
+        for (start, start_color), (end, end_color) in zip(stops, stops[1:]):
+            if t <= end:
+                f = (t - start) / ((end - start) or 1.0)
+                return tuple(int(a + (b - a) * f + 0.5) for a, b in zip(start_color, end_color))
+        return stops[-1][1]
+
+    def draw_background(self, surface, properties, state, bk_color, rect):
+        # surface is expected to be cleared
+        if properties.style == 'gradient':
+            surface.blit(self.gradient(rect.size, properties.gradient_stops(state),
+                                       properties.gradient_type, properties.gradient_angle), (0, 0))
+        elif bk_color[3]:
+            # the pixels blending bk_color twice (as surface alpha on a surface filled with it) onto a cleared
+            # surface gives, filled straight in
+            alpha = bk_color[3] * bk_color[3] // 255
+            surface.fill((bk_color[0] * alpha // 255, bk_color[1] * alpha // 255, bk_color[2] * alpha // 255, alpha),
+                         pygame.Rect(0, 0, rect.width, rect.height))
+
+    @staticmethod
+    def _scratch_surface(surface, size, convert=False):
+        # surface cleared for drawing again when it's already size, otherwise a new transparent surface,
+        # in the display pixel format with convert
+        if surface and surface.get_size() == size:
+            surface.fill((0, 0, 0, 0))
+            return surface
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        return PyGameControls._display_format(surface) if convert else surface
+
+    @staticmethod
+    def _display_format(surface):
+        # surface in the pixel format of the display, the surface itself when there's no display yet
+        if not pygame.display.get_surface():
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    @property
+    def text_renderer(self):
+        return self._text_renderer
+
+    @text_renderer.setter
+    def text_renderer(self, text_renderer):
+        if text_renderer not in SUPPORTED_TEXT_RENDERERS:
+            print('text_renderer not a supported renderer,', text_renderer)
+            raise ValueError
+        self._text_renderer = text_renderer
+
+    def glyph_metrics(self, pygame_font):
+        metrics = self._glyph_metrics.get(pygame_font)
+        if not metrics:
+            metrics = GlyphMetrics(pygame_font)
+            self._glyph_metrics[pygame_font] = metrics
+        return metrics
+
     @property
     def default_font(self):
         return self._default_font
@@ -117,6 +464,15 @@ class PyGameControls(object):
         if not attribute:
             attribute = self._default_attribute
 
+        if self._pending_font_files:
+            with self._font_lock:
+                if family_name not in self._fonts:
+                    self.__resolve_family(family_name)
+                elif attribute[0] not in self._fonts[family_name]:
+                    # the family is known but the file with this style may not have been opened yet, the warm-up
+                    # registers one file at a time
+                    self.__resolve_family(family_name, exhaustive=False)
+
         if family_name in self._fonts:
             if attribute[0] in self._fonts[family_name]:
                 return self._fonts[family_name][attribute[0]]
@@ -190,21 +546,21 @@ class PyGameControls(object):
 
         return font_files
 
-    def __init_fonts(self):
-        fonts = dict()
-
+    def __init_fonts(self, lazy_fonts):
         for font in self._font_files:
-            f = ImageFont.truetype(font)
-            family_lower = f.font.family.lower()
-            style_lower = f.font.style.lower()
-
-            if family_lower in fonts:
-                fonts[family_lower].update({style_lower: font})
+            if lazy_fonts and not self.__font_indexed(font):
+                self._pending_font_files.append(font)
             else:
-                fonts[family_lower] = {'family': f.font.family, style_lower: font}
-            del f
+                self.__register_font(font)
+
+        fonts = self._fonts
+
+        if self._default_font_key and self._pending_font_files:
+            self.__resolve_family(self._default_font_key, exhaustive=False)
 
         if not self._default_font_key or self._default_font_key not in fonts:
+            if self._pending_font_files:
+                self.__resolve_family('freesans', exhaustive=False)
             if 'freesans' in fonts:
                 if 'regular' in fonts['freesans']:
                     self._default_font = fonts['freesans']['family']
@@ -214,39 +570,161 @@ class PyGameControls(object):
 
         if not self._default_font_key or self._default_font_key not in fonts:
             print('Windows Segoe UI and backup FreeSans font not in system, selecting a random font')
-            for font in fonts:
-                if 'regular' in fonts[font]:
-                    self._default_font = fonts[font]['family']
-                    self._default_font_key = font
-                    self._default_attribute = ['regular']
-                    self._default_font_file = fonts[self._default_font_key]['regular']
+            while True:
+                for font in fonts:
+                    if 'regular' in fonts[font]:
+                        self._default_font = fonts[font]['family']
+                        self._default_font_key = font
+                        self._default_attribute = ['regular']
+                        self._default_font_file = fonts[self._default_font_key]['regular']
+                        break
+                # lazy fonts, keep opening fonts until one with a regular style shows up
+                if self._default_font_key in fonts or not self._pending_font_files:
                     break
+                self.__resolve_fonts(self._pending_font_files[:1])
         else:
             self._default_font_file = fonts[self._default_font_key][self._default_attribute[0]]
 
-        return fonts
+    def __register_font(self, font):
+        family, style = self.__font_info(font)
+        family_lower = family.lower()
+        style_lower = style.lower()
 
-    @staticmethod
-    def _check_style(style, default, forced_styles):
-        if not style or len(style) == 0:
-            return default
-        elif not isinstance(style, list):
-            if isinstance(style, int):
-                style = [style]
-            elif isinstance(style, str):
-                style = [int(style)]
+        if family_lower in self._fonts:
+            self._fonts[family_lower].update({style_lower: font})
         else:
-            for i in range(len(style)):
-                if isinstance(style[i], str):
-                    style[i] = int(style[i])
-        if forced_styles and isinstance(forced_styles, list):
-            style += forced_styles
+            self._fonts[family_lower] = {'family': family, style_lower: font}
+
+    def __resolve_fonts(self, font_files):
+        with self._font_lock:
+            for font in font_files:
+                if font in self._pending_font_files:
+                    self._pending_font_files.remove(font)
+                    self.__register_font(font)
+
+    def __resolve_family(self, family_name, exhaustive=True):
+        # only open the pending files whose name looks like the family, e.g. 'segoe ui' -> segoeui.ttf, segoeuib.ttf
+        family_key = self.__name_key(family_name)
+        if not family_key:
+            return
+
+        candidates = []
+        with self._font_lock:
+            for font in self._pending_font_files:
+                file_key = self.__name_key(os.path.splitext(os.path.basename(font))[0])
+                if file_key.startswith(family_key) or (len(file_key) >= 3 and family_key.startswith(file_key)):
+                    candidates.append(font)
+        self.__resolve_fonts(candidates)
+
+        # the file names didn't give the family away, fall back to opening everything that's left
+        if exhaustive and family_name not in self._fonts and self._pending_font_files:
+            self.__resolve_fonts(list(self._pending_font_files))
+
+    def __warm_up_fonts(self):
+        while True:
+            with self._font_lock:
+                if not self._pending_font_files:
+                    self.__save_font_index()
+                    return
+                font = self._pending_font_files.pop()
+                try:
+                    self.__register_font(font)
+                except OSError as e:
+                    print('error loading font:', font, e)
+
+    @staticmethod
+    def __name_key(name):
+        return ''.join(c for c in name.lower() if c.isalnum())
+
+    def __font_indexed(self, font):
+        entry = self._font_index.get(font)
+        if not entry:
+            return False
+        try:
+            stat = os.stat(font)
+        except OSError:
+            return False
+        return entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size
+
+    def __font_info(self, font):
+        # returns (family, style) of a font file, only opening the file when the index entry is missing or stale
+        stat = os.stat(font)
+        entry = self._font_index.get(font)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2], entry[3]
+
+        f = ImageFont.truetype(font)
+        family = f.font.family
+        style = f.font.style
+        del f
 
-        seen = set()
-        return [x for x in style if not (x in seen or seen.add(x))]
+        self._font_index[font] = [stat.st_mtime_ns, stat.st_size, family, style]
+        self._font_index_changed = True
+        return family, style
+
+    def __load_font_index(self):
+        if not self._font_index_file:
+            return dict()
+
+        try:
+            with open(self._font_index_file, 'r', encoding='utf-8') as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return dict()
+
+        if not isinstance(index, dict) or index.get('version') != FONT_INDEX_VERSION \
+                or not isinstance(index.get('fonts'), dict):
+            return dict()
+        return index['fonts']
+
+    def __save_font_index(self):
+        if not self._font_index_file:
+            return
+
+        # drop fonts that are no longer installed so the index doesn't grow forever
+        font_files = set(self._font_files)
+        for font in [font for font in self._font_index if font not in font_files]:
+            if not os.path.isfile(font):
+                del self._font_index[font]
+                self._font_index_changed = True
+
+        if not self._font_index_changed:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self._font_index_file), exist_ok=True)
+            # write to a temporary file first so a crash can't leave a half written index behind, each process
+            # gets its own so two of them saving at once can't write into the same one
+            descriptor, temp_file = tempfile.mkstemp(prefix='font_index.', suffix='.tmp',
+                                                     dir=os.path.dirname(self._font_index_file))
+            try:
+                with os.fdopen(descriptor, 'w', encoding='utf-8') as index_file:
+                    json.dump({'version': FONT_INDEX_VERSION, 'fonts': self._font_index}, index_file)
+                os.replace(temp_file, self._font_index_file)
+            except BaseException:
+                os.remove(temp_file)
+                raise
+            self._font_index_changed = False
+        except OSError as e:
+            print('unable to save the font index:', self._font_index_file, e)
 
     @staticmethod
-    def _format_text(text_to_format, pygame_font, rect, style, wrap_at_letter=True):
+    def _check_style(style, default, forced_styles):
+        # StyleMask of style (a StyleMask, a style constant or a list of them), default when there's no style
+        # forced_styles are added to a style given, the list passed in is left alone
+        if not style:
+            return StyleMask.of(default)
+        elif isinstance(style, StyleMask):
+            mask = style
+        elif isinstance(style, int) or isinstance(style, str):
+            mask = StyleMask.of([int(style)])
+        else:
+            mask = StyleMask.of([int(x) if isinstance(x, str) else x for x in style])
+        if forced_styles:
+            mask = StyleMask(mask | StyleMask.of(forced_styles))
+        return mask
+
+    def _format_text(self, text_to_format, pygame_font, rect, style, wrap_at_letter=True):
         if not isinstance(text_to_format, str):
             text_to_format = str(text_to_format)
 
@@ -259,28 +737,38 @@ class PyGameControls(object):
 
         # text_to_format that will hold the newly formatted text_to_format
         new_string = ''
+        metrics = self.glyph_metrics(pygame_font)
 
         for line in lines_of_string:
             if line == '':
                 new_string += '\n'
             else:
                 while line:
-                    amps = []
-
-                    if TS_NOPREFIX not in style:
-                        while line.find('&') != -1:
-                            index = line.find('&')
-                            amps.append(index)
-                            line = line[:index] + line[index + 1:]
+                    # the '&'s are only taken out of the start of the line that can fit on this row, taking them
+                    # out of the whole rest of a long paragraph for every row is quadratic
+                    # when the row runs past that start they're taken out of the whole line
+                    if TS_NOPREFIX in style or TS_LEFTNOWORDWRAP in style:
+                        end = len(line)
+                    else:
+                        end = min(metrics.span(line, rect.width, '&') + 8, len(line))
+                    while True:
+                        amps = []
+                        head = line[:end]
+                        if TS_NOPREFIX not in style:
+                            while head.find('&') != -1:
+                                index = head.find('&')
+                                amps.append(index)
+                                head = head[:index] + head[index + 1:]
+                        if TS_LEFTNOWORDWRAP in style:
+                            break
+                        # first character that doesn't fit on this line
+                        char_index, line_size = metrics.fit(head + line[end:], rect.width)
+                        if char_index < len(head) or end == len(line):
+                            break
+                        end = len(line)
+                    line = head + line[end:]
 
                     if TS_LEFTNOWORDWRAP not in style:
-                        char_index = 0
-                        line_size = pygame_font.size(line[:char_index])[0]
-                        # start building this line
-                        while line_size <= rect.width and char_index < len(line):
-                            char_index += 1
-                            line_size = pygame_font.size(line[:char_index])[0]
-
                         if len(amps):
                             for amp in reversed(amps):
                                 if amp < char_index:
@@ -331,6 +819,69 @@ class PyGameControls(object):
         # return the properly formatted string, complete with newlines
         return new_string[:-1]
 
+    def _layout_text(self, text, font, rect, style):
+        # wrapped lines of text for a Font, the same text, font, width and style always wrap the same way
+        key = (text, font.font_file, font.font_size, rect.width, StyleMask.of(style))
+        lines = self._layout_cache.get(key)
+        if lines is None:
+            lines = tuple(self._format_text(text, font.pygame_font, rect, style).splitlines())
+            self._layout_cache.put(key, lines)
+        return list(lines)
+
+    def _render_line(self, font, line, text_color, amps):
+        # rendered line of text with the prefix underlines and text alpha applied
+        # the surface is shared by everything drawing the same line, don't draw on it
+        key = (font.font_file, font.font_size, line, text_color, tuple(amps))
+        string_surface = self._text_cache.get(key)
+        if string_surface is not None:
+            return string_surface
+
+        string_surface = font.pygame_font.render(line, True, text_color)
+        self._draw_underlines(string_surface, font, line, text_color, amps, 0, 0)
+
+        if text_color[3] != 255:
+            string_surface.fill((255, 255, 255, text_color[3]), special_flags=pygame.BLEND_RGBA_MULT)
+
+        self._text_cache.put(key, string_surface)
+        return string_surface
+
+    @staticmethod
+    def _draw_underlines(surface, font, line, text_color, amps, x, y):
+        pygame_font = font.pygame_font
+        for amp in amps:
+            line_size = int(font.font_size * 0.10)
+            chr_width = pygame_font.size(line[amp:amp + 1])[0]
+            x_start = x + pygame_font.size(line[:amp])[0]
+            y_start = y + pygame_font.get_height() - line_size
+            pygame.draw.line(surface, text_color, (x_start, y_start),
+                             (x_start + chr_width, y_start),
+                             line_size)
+
+    def _draw_style_overlay(self, surface, properties, style, bk_color, border_color, rect):
+        # draw_style through an overlay shared by every control of the same size, style and border
+        # draw_style sets pixels rather than blending them, blitting an overlay only gives the same pixels when
+        # the border is opaque, other borders are drawn straight on surface
+        px_border = properties.px_border if properties.px_border and bk_color != border_color else 0
+        if px_border and border_color[3] != 255:
+            self.draw_style(surface, properties, style, bk_color, border_color, rect)
+            return
+
+        frame_style = None
+        for frame in (SS_ETCHEDFRAME, SS_ETCHEDHORZ, SS_ETCHEDVERT, SS_SUNKEN):
+            if frame in style:
+                frame_style = frame
+                break
+        if not px_border and frame_style is None:
+            return
+
+        key = (rect.size, frame_style, px_border, border_color if px_border else None)
+        overlay = self._overlay_cache.get(key)
+        if not overlay:
+            overlay = pygame.Surface(rect.size, pygame.SRCALPHA)
+            self.draw_style(overlay, properties, style, bk_color, border_color, rect)
+            self._overlay_cache.put(key, overlay)
+        surface.blit(overlay, (0, 0))
+
     @staticmethod
     def draw_style(surface, properties, style, bk_color, border_color, rect):
         if properties.px_border and bk_color != border_color:
@@ -380,8 +931,785 @@ class PyGameControls(object):
                               1)
 
 
+class StyleMask(int):
+    # a set of style constants as an int with bit style + 1 set for each of them (IMS_ANIMATION is -1)
+    # membership is a shift, comparing and hashing is comparing and hashing an int
+    __slots__ = ()
+
+    @staticmethod
+    def of(styles):
+        if isinstance(styles, StyleMask):
+            return styles
+        mask = 0
+        for style in styles:
+            mask |= 1 << (style + 1)
+        return StyleMask(mask)
+
+    def __contains__(self, style):
+        return style >= -1 and bool(self >> (style + 1) & 1)
+
+    def __iter__(self):
+        mask = int(self)
+        style = -1
+        while mask:
+            if mask & 1:
+                yield style
+            mask >>= 1
+            style += 1
+
+    def __len__(self):
+        return bin(self).count('1')
+
+    def __repr__(self):
+        return 'StyleMask(%s)' % list(self)
+
+
+def natural_key(text):
+    # sorts 'frame2' before 'frame10'
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', text)]
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+class LRUCache(object):
+    # least recently used cache holding at most capacity entries and/or max_bytes bytes as measured by sizeof
+    # a capacity or max_bytes of None means no limit, 0 disables the cache
+    def __init__(self, capacity, max_bytes=None, sizeof=None):
+        self.__entries = collections.OrderedDict()
+        self.__capacity = None if capacity is None else max(int(capacity), 0)
+        self.__max_bytes = None if max_bytes is None else max(int(max_bytes), 0)
+        self.__sizeof = sizeof
+        self.__sizes = dict()
+        self.__memory = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key, default=None):
+        value = self.__entries.get(key, self)
+        if value is self:
+            self.__misses += 1
+            return default
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.__capacity == 0 or self.__max_bytes == 0:
+            return
+
+        if key in self.__entries:
+            self.pop(key)
+        size = self.__sizeof(value) if self.__sizeof else 0
+        if self.__max_bytes is not None and size > self.__max_bytes:
+            # would push everything else out and still not fit
+            return
+
+        self.__entries[key] = value
+        self.__sizes[key] = size
+        self.__memory += size
+        self.__evict()
+
+    def pop(self, key, default=None):
+        if key not in self.__entries:
+            return default
+        self.__memory -= self.__sizes.pop(key)
+        return self.__entries.pop(key)
+
+    def clear(self):
+        self.__entries.clear()
+        self.__sizes.clear()
+        self.__memory = 0
+        self.__hits = self.__misses = 0
+
+    def __evict(self):
+        while self.__entries and \
+                ((self.__capacity is not None and len(self.__entries) > self.__capacity)
+                 or (self.__max_bytes is not None and self.__memory > self.__max_bytes)):
+            key, value = self.__entries.popitem(last=False)
+            self.__memory -= self.__sizes.pop(key)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    @property
+    def max_bytes(self):
+        return self.__max_bytes
+
+    @property
+    def memory(self):
+        return self.__memory
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    @property
+    def stats(self):
+        return {'hits': self.__hits,
+                'misses': self.__misses,
+                'entries': len(self.__entries),
+                'capacity': self.__capacity,
+                'memory': self.__memory,
+                'max_bytes': self.__max_bytes}
+
+    @capacity.setter
+    def capacity(self, capacity):
+        self.__capacity = None if capacity is None else max(int(capacity), 0)
+        self.__evict()
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        self.__max_bytes = None if max_bytes is None else max(int(max_bytes), 0)
+        self.__evict()
+
+
+class GlyphMetrics(object):
+    # caches the advance of every character drawn with a pygame font so a line can be measured with
+    # cumulative widths instead of asking FreeType for every prefix of it
+    def __init__(self, pygame_font):
+        self.__font = pygame_font
+        self.__advances = dict()
+
+    def advance(self, char):
+        advance = self.__advances.get(char)
+        if advance is None:
+            self.__cache_advances(char)
+            advance = self.__advances[char]
+        return advance
+
+    def __cache_advances(self, text):
+        missing = ''.join(c for c in set(text) if c not in self.__advances)
+        if not missing:
+            return
+        try:
+            metrics = self.__font.metrics(missing)
+        except (pygame.error, UnicodeError):
+            metrics = [None] * len(missing)
+        for char, metric in zip(missing, metrics):
+            # characters the font doesn't have are measured by FreeType (replacement box)
+            self.__advances[char] = metric[4] if metric else self.__font.size(char)[0]
+
+    def span(self, text, width, ignore=''):
+        # index just past the character whose advance takes the width of text over width, len(text) if it never
+        # does, characters in ignore aren't counted
+        # advances are only added up until they pass width, so a wrapped row costs its own length and not the
+        # length of the rest of the paragraph
+        advances = self.__advances
+        total = 0
+        for index, char in enumerate(text):
+            if char in ignore:
+                continue
+            advance = advances.get(char)
+            if advance is None:
+                advance = self.advance(char)
+            total += advance
+            if total > width:
+                return index + 1
+        return len(text)
+
+    def fit(self, text, width):
+        # returns the index of the first character that makes text[:index] wider than width (or len(text) if
+        # it all fits) and the width of text[:index]
+        # the cumulative advances don't include kerning, so the guess is checked against the real size
+        size = self.__font.size
+        length = len(text)
+        index = self.span(text, width)
+
+        while index > 0 and size(text[:index - 1])[0] > width:
+            index -= 1
+        text_width = size(text[:index])[0]
+        while text_width <= width and index < length:
+            index += 1
+            text_width = size(text[:index])[0]
+        return index, text_width
+
+
+class GlyphAtlas(object):
+    # every (font, size, color, glyph) is rendered once into a shared atlas page, lines are then drawn straight
+    # onto the control by blitting the glyphs out of the pages with one Surface.blits call
+    # SDL_ttf positions glyphs with sub-pixel advances, so a glyph can land a pixel away from where
+    # pygame.font.Font.render would put it
+    # once the pages take more than max_bytes the least recently used ones are dropped with every glyph on them,
+    # a max_bytes of None means no limit
+    def __init__(self, page_size=512, max_bytes=None):
+        self.__page_size = page_size
+        self.__max_bytes = None if max_bytes is None else max(int(max_bytes), 0)
+        # page (or glyph too big for a page) -> [({glyph: (page, rect)}, glyph)] of the glyphs on it,
+        # least recently used first
+        self.__pages = collections.OrderedDict()
+        self.__memory = 0
+        # page being filled
+        self.__page = None
+        # (font_file, size, color) -> {glyph: (page, rect)}
+        self.__glyphs = dict()
+        # (font_file, size) -> {pair of glyphs: kerning}
+        self.__kerning = dict()
+        # next free spot on the page being filled and the height of the shelf being filled
+        self.__x = self.__y = self.__shelf_height = 0
+
+    def line_blits(self, font, line, text_color):
+        # returns [(page, x, area)] for every glyph of the line and the width of the line
+        # the glyphs have the text alpha applied, draw them with draw()
+        pygame_font = font.pygame_font
+        glyphs = self.__glyphs.setdefault((font.font_file, font.font_size, text_color), dict())
+        kerning = self.__kerning.setdefault((font.font_file, font.font_size), dict())
+        pages = self.__pages
+        used = set()
+        blits = []
+        x = 0
+        previous = None
+        for char in line:
+            glyph = glyphs.get(char)
+            if not glyph:
+                glyph_surface = pygame_font.render(char, True, text_color)
+                glyph_surface.fill((255, 255, 255, text_color[3]), special_flags=pygame.BLEND_RGBA_MULT)
+                glyph = self.__add_glyph(glyph_surface)
+                glyphs[char] = glyph
+                pages[glyph[0]].append((glyphs, char))
+            if glyph[0] not in used:
+                # the pages this line uses are the most recently used, so adding a glyph further on can't drop them
+                pages.move_to_end(glyph[0])
+                used.add(glyph[0])
+            if previous:
+                # glyphs are rendered on their own, the pair tells how much closer they sit in a line
+                pair = previous + char
+                kern = kerning.get(pair)
+                if kern is None:
+                    kern = pygame_font.size(pair)[0] - pygame_font.size(previous)[0] - glyph[1].width
+                    kerning[pair] = kern
+                x += kern
+            blits.append((glyph[0], x, glyph[1]))
+            x += glyph[1].width
+            previous = char
+        return blits, x
+
+    @staticmethod
+    def draw(surface, blits, x, y):
+        surface.blits([(page, (x + glyph_x, y), area) for page, glyph_x, area in blits], False)
+
+    def __add_glyph(self, glyph_surface):
+        width, height = glyph_surface.get_size()
+
+        if width > self.__page_size or height > self.__page_size:
+            # too big to share a page
+            self.__add_page(glyph_surface)
+            return glyph_surface, pygame.Rect(0, 0, width, height)
+
+        if not self.__page or self.__x + width > self.__page_size:
+            # start a new shelf
+            self.__x = 0
+            self.__y += self.__shelf_height
+            self.__shelf_height = 0
+        if not self.__page or self.__y + height > self.__page_size:
+            self.__page = pygame.Surface((self.__page_size, self.__page_size), pygame.SRCALPHA)
+            self.__x = self.__y = self.__shelf_height = 0
+            self.__add_page(self.__page)
+
+        page = self.__page
+        rect = pygame.Rect(self.__x, self.__y, width, height)
+        page.blit(glyph_surface, rect)
+        self.__x += width
+        self.__shelf_height = max(self.__shelf_height, height)
+        return page, rect
+
+    def __add_page(self, page):
+        self.__pages[page] = []
+        self.__memory += surface_bytes(page)
+        self.__evict()
+
+    def __evict(self):
+        # the most recently used page is always kept, it may be the one a glyph was just added to
+        while self.__max_bytes is not None and self.__memory > self.__max_bytes and len(self.__pages) > 1:
+            page, glyphs = self.__pages.popitem(last=False)
+            for page_glyphs, char in glyphs:
+                del page_glyphs[char]
+            self.__memory -= surface_bytes(page)
+            if page is self.__page:
+                self.__page = None
+
+    def clear(self):
+        self.__pages.clear()
+        self.__memory = 0
+        self.__page = None
+        self.__glyphs.clear()
+        self.__kerning.clear()
+        self.__x = self.__y = self.__shelf_height = 0
+
+    @property
+    def max_bytes(self):
+        return self.__max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        self.__max_bytes = None if max_bytes is None else max(int(max_bytes), 0)
+        self.__evict()
+
+    @property
+    def stats(self):
+        return {'glyphs': sum(len(glyphs) for glyphs in self.__glyphs.values()),
+                'pages': len(self.__pages),
+                'memory': self.__memory,
+                'max_bytes': self.__max_bytes}
+
+
+class FontPool(object):
+    # pygame.font.Font objects shared by every Font with the same file and size
+    # the pygame fonts handed out are shared, calling set_bold, set_underline, etc. on them affects every user
+    def __init__(self):
+        # (font_file, size) -> [pygame.font.Font, reference count]
+        self.__fonts = dict()
+        self.__hits = 0
+        self.__misses = 0
+
+    def acquire(self, font_file, size):
+        key = (font_file, size)
+        entry = self.__fonts.get(key)
+        if entry:
+            entry[1] += 1
+            self.__hits += 1
+            return entry[0]
+
+        self.__misses += 1
+        font = pygame.font.Font(font_file, size)
+        self.__fonts[key] = [font, 1]
+        return font
+
+    def release(self, font_file, size):
+        key = (font_file, size)
+        entry = self.__fonts.get(key)
+        if not entry:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self.__fonts[key]
+
+    def clear(self):
+        self.__fonts.clear()
+        self.__hits = self.__misses = 0
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    @property
+    def stats(self):
+        references = 0
+        memory = 0
+        for (font_file, size), entry in self.__fonts.items():
+            references += entry[1]
+            # FreeType doesn't report how much a face uses, the size of the font file is a close lower bound
+            if font_file and os.path.isfile(font_file):
+                memory += os.path.getsize(font_file)
+        return {'hits': self.__hits,
+                'misses': self.__misses,
+                'fonts': len(self.__fonts),
+                'references': references,
+                'memory': memory}
+
+
+class ImageCache(object):
+    # images loaded from files, shared by every Picture showing the same file
+    # images are reference counted, once nothing uses an image it's kept around for reuse until the unused
+    # images take more than max_bytes, then the least recently used ones are dropped
+    # the images handed out are shared, don't draw on them
+    # with convert set images are converted to the display's pixel format, images loaded before the display was
+    # set up are converted the first time they're acquired or passed to convert once there is one
+    # a path can also name an image on a sprite sheet, handed out as a subsurface of the shared sheet:
+    #   'sheet.png#x,y,width,height'  the area of sheet.png
+    #   'atlas.json#name'             the frame called name in a TexturePacker style JSON atlas, either
+    #                                 {"frames": {name: {"frame": {"x", "y", "w", "h"}}}, "meta": {"image": file}}
+    #                                 with frames also as a list of {"filename": name, "frame": ...}, or
+    #                                 {"image": file, "frames": {name: [x, y, width, height]}}
+    #                                 the image file is relative to the JSON file
+    def __init__(self, max_bytes=32 * 1024 * 1024, convert=True):
+        self.__max_bytes = max(int(max_bytes or 0), 0)
+        self.__convert = convert
+        # (path, mtime) -> [surface, reference count, {area: subsurface}, converted,
+        #                   [surfaces handed out before it was converted]]
+        self.__images = dict()
+        # id(surface or subsurface) -> (path, mtime), to release by surface
+        self.__keys = dict()
+        # (JSON path, mtime) -> (image path, {name: pygame.Rect})
+        self.__atlases = dict()
+        # (path, mtime) of images nothing uses, least recently used first
+        self.__unused = collections.OrderedDict()
+        self.__unused_bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        # images can be loaded from the image thread pool
+        self.__lock = threading.RLock()
+
+    def acquire(self, path, loaded=None):
+        # returns the image in path, None when it can't be loaded
+        # loaded is what load(path) returned in the background, its image is used instead of loading the file again
+        sheet, area = self.__sprite(path)
+        if not area:
+            return self.__acquire(sheet, loaded) if sheet else None
+
+        image = self.__acquire(sheet, loaded)
+        if not image:
+            return None
+        with self.__lock:
+            key = self.__keys[id(image)]
+            subsurfaces = self.__images[key][2]
+            subsurface = subsurfaces.get(area)
+            if not subsurface:
+                if not image.get_rect().contains(area):
+                    print('error loading image:', path, '\nsprite outside of', sheet)
+                    self.release(image)
+                    return None
+                subsurface = subsurfaces[area] = image.subsurface(area)
+                self.__keys[id(subsurface)] = key
+            return subsurface
+
+    def load(self, path):
+        # decodes the image in path for acquire without touching the cache or the display, so it can run on
+        # another thread, returns (modification time of the file, image) so the image is cached under the
+        # version of the file it was decoded from even when the file changes before acquire
+        # None when it's cached already or can't be loaded (acquire reports the error)
+        sheet = self.__sprite(path)[0]
+        if not sheet:
+            return None
+        try:
+            key = (sheet, os.stat(sheet).st_mtime_ns)
+        except OSError:
+            return None
+        with self.__lock:
+            if key in self.__images:
+                return None
+        surface = self.__decode(sheet, False)
+        return (key[1], surface) if surface else None
+
+    @staticmethod
+    def __decode(path, report=True):
+        try:
+            return pygame.image.load(path)
+        except (pygame.error, OSError, ValueError) as e:
+            # the file can go away or change between the stat and the load
+            if report:
+                print('error loading image:', path, e)
+            return None
+
+    def sprites(self, path):
+        # paths of every sprite in a JSON atlas, in name order
+        atlas = self.__atlas(path)
+        if not atlas:
+            return []
+        return [path + '#' + name for name in sorted(atlas[1], key=natural_key)]
+
+    def exists(self, path):
+        # True when path is an image file or a sprite on one, doesn't check the sprite is on the sheet
+        sheet, area = self.__sprite(path)
+        return bool(sheet) and os.path.isfile(sheet)
+
+    def __sprite(self, path):
+        # (image file, sprite area or None) for path, (None, None) when a sprite can't be found
+        if '#' not in path or os.path.isfile(path):
+            return path, None
+
+        sheet, name = path.rsplit('#', 1)
+        if sheet.lower().endswith('.json'):
+            atlas = self.__atlas(sheet)
+            if not atlas or name not in atlas[1]:
+                print('error loading image:', path, '\nno such sprite')
+                return None, None
+            return atlas[0], atlas[1][name]
+
+        try:
+            area = tuple(int(v) for v in name.split(','))
+        except ValueError:
+            area = ()
+        if len(area) != 4:
+            print('error loading image:', path, '\nsprite area should be x,y,width,height')
+            return None, None
+        return sheet, area
+
+    def __atlas(self, path):
+        try:
+            key = (path, os.stat(path).st_mtime_ns)
+        except OSError:
+            return None
+
+        with self.__lock:
+            atlas = self.__atlases.get(key)
+        if atlas:
+            return atlas
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                descriptor = json.load(f)
+            image = descriptor.get('image') or descriptor.get('meta', {}).get('image')
+            frames = descriptor['frames']
+            if isinstance(frames, list):
+                frames = {frame['filename']: frame for frame in frames}
+            areas = dict()
+            for name, frame in frames.items():
+                if isinstance(frame, dict):
+                    if frame.get('rotated'):
+                        print('rotated sprite', name, 'in', path, 'not supported')
+                        continue
+                    frame = frame['frame']
+                    frame = (frame['x'], frame['y'], frame['w'], frame['h'])
+                areas[name] = tuple(int(v) for v in frame)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print('error reading sprite atlas:', path, e)
+            return None
+
+        atlas = (os.path.join(os.path.dirname(path), image), areas)
+        with self.__lock:
+            self.__atlases[key] = atlas
+        return atlas
+
+    def __acquire(self, path, loaded=None):
+        surface = None
+        if loaded:
+            key = (path, loaded[0])
+            surface = loaded[1]
+        else:
+            try:
+                key = (path, os.stat(path).st_mtime_ns)
+            except OSError:
+                return None
+
+        with self.__lock:
+            entry = self.__images.get(key)
+            if entry:
+                return self.__hit(key, entry)
+
+        # decode outside of the lock so other threads can keep using the cache
+        if not surface:
+            surface = self.__decode(path)
+            if not surface:
+                return None
+        converted = not self.__convert or pygame.display.get_surface() is not None
+        if self.__convert:
+            surface = PyGameControls._display_format(surface)
+
+        with self.__lock:
+            entry = self.__images.get(key)
+            if entry:
+                # another thread loaded it first
+                return self.__hit(key, entry)
+
+            self.__misses += 1
+            self.__images[key] = [surface, 1, dict(), converted, []]
+            self.__keys[id(surface)] = key
+            return surface
+
+    def __hit(self, key, entry):
+        self.__hits += 1
+        if key in self.__unused:
+            self.__unused_bytes -= surface_bytes(entry[0])
+            del self.__unused[key]
+        entry[1] += 1
+        self.__convert_entry(key, entry)
+        return entry[0]
+
+    def __convert_entry(self, key, entry):
+        # converts an image loaded before there was a display, the surfaces already handed out are kept and can
+        # still be released or passed to convert until nothing uses the image any more
+        if entry[3] or not pygame.display.get_surface():
+            return
+        surface = PyGameControls._display_format(entry[0])
+        entry[4].append(entry[0])
+        entry[4].extend(entry[2].values())
+        entry[0] = surface
+        entry[2] = {area: surface.subsurface(area) for area in entry[2]}
+        entry[3] = True
+        self.__keys[id(surface)] = key
+        for subsurface in entry[2].values():
+            self.__keys[id(subsurface)] = key
+
+    def convert(self, image):
+        # image (or sprite) taken from the cache in the display's pixel format, image itself when it already is
+        # or there's no display yet
+        with self.__lock:
+            key = self.__keys.get(id(image))
+            if not key:
+                return image
+            entry = self.__images[key]
+            self.__convert_entry(key, entry)
+            if not image.get_parent():
+                return entry[0]
+            return entry[2].get(image.get_offset() + image.get_size(), image)
+
+    def release(self, surface):
+        with self.__lock:
+            key = self.__keys.get(id(surface))
+            if not key:
+                return
+            entry = self.__images[key]
+            entry[1] -= 1
+            if entry[1] <= 0:
+                for old in entry[4]:
+                    del self.__keys[id(old)]
+                entry[4] = []
+                self.__unused[key] = None
+                self.__unused_bytes += surface_bytes(entry[0])
+                self.__evict()
+
+    def __evict(self):
+        while self.__unused and self.__unused_bytes > self.__max_bytes:
+            key = self.__unused.popitem(last=False)[0]
+            surface, count, subsurfaces, converted, old = self.__images.pop(key)
+            del self.__keys[id(surface)]
+            for subsurface in subsurfaces.values():
+                del self.__keys[id(subsurface)]
+            self.__unused_bytes -= surface_bytes(surface)
+
+    def clear(self):
+        # drops the images nothing is using
+        with self.__lock:
+            max_bytes = self.__max_bytes
+            self.__max_bytes = 0
+            self.__evict()
+            self.__max_bytes = max_bytes
+
+    @property
+    def max_bytes(self):
+        return self.__max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        with self.__lock:
+            self.__max_bytes = max(int(max_bytes or 0), 0)
+            self.__evict()
+
+    @property
+    def stats(self):
+        with self.__lock:
+            memory = sum(surface_bytes(entry[0]) for entry in self.__images.values())
+            return {'hits': self.__hits,
+                    'misses': self.__misses,
+                    'images': len(self.__images),
+                    'sprites': sum(len(entry[2]) for entry in self.__images.values()),
+                    'references': sum(entry[1] for entry in self.__images.values()),
+                    'unused': len(self.__unused),
+                    'memory': memory,
+                    'unused_memory': self.__unused_bytes,
+                    'max_bytes': self.__max_bytes}
+
+
+class ScaledImageCache(object):
+    # copies of images scaled to a size, keyed by (image, size, smooth), so pictures stretched to the same sizes
+    # over and over (window resizes) only scale each image once per size
+    # scaling always starts from the original image, never from a copy that was already scaled
+    # with smooth set images are scaled with smoothscale, downscales then start from the closest of a set of
+    # halved copies of the image (mip levels) that are built on first use and kept as long as the image lives
+    def __init__(self, max_bytes=16 * 1024 * 1024, smooth=False, mip_levels=4):
+        self.__cache = LRUCache(None, max_bytes, lambda entry: surface_bytes(entry[1]))
+        self.__smooth = smooth
+        self.__mip_levels = max(int(mip_levels), 0)
+        # scaled copy -> original image
+        self.__sources = weakref.WeakKeyDictionary()
+        # original image -> [half size copy, quarter size copy, ...]
+        self.__mips = weakref.WeakKeyDictionary()
+
+    def source(self, surface):
+        # the original image surface was scaled from, surface itself when it wasn't scaled here
+        return self.__sources.get(surface, surface)
+
+    def scale(self, surface, size, smooth=None):
+        source = self.source(surface)
+        size = (int(size[0]), int(size[1]))
+        if size == source.get_size():
+            return source
+        if smooth is None:
+            smooth = self.__smooth
+        # smoothscale only handles 24 and 32 bit images
+        smooth = smooth and source.get_bitsize() >= 24
+
+        key = (id(source), size, smooth)
+        entry = self.__cache.get(key)
+        # the entry holds on to the source, its id can't be reused while it's cached
+        if entry:
+            return entry[1]
+
+        if smooth:
+            base = self.__mip(source, size)
+            scaled = base if base.get_size() == size else pygame.transform.smoothscale(base, size)
+        else:
+            scaled = pygame.transform.scale(source, size)
+        self.__cache.put(key, (source, scaled))
+        if scaled is not source:
+            self.__sources[scaled] = source
+        return scaled
+
+    def __mip(self, source, size):
+        # smallest mip level that is still at least size, source when size isn't a downscale by half or more
+        mips = self.__mips.get(source)
+        if mips is None:
+            mips = self.__mips[source] = []
+
+        base = source
+        for level in range(self.__mip_levels):
+            width = base.get_width() // 2
+            height = base.get_height() // 2
+            if width < size[0] or height < size[1] or not width or not height:
+                break
+            if level == len(mips):
+                mips.append(pygame.transform.smoothscale(base, (width, height)))
+            base = mips[level]
+        return base
+
+    def clear(self):
+        self.__cache.clear()
+        self.__mips.clear()
+
+    @property
+    def smooth(self):
+        return self.__smooth
+
+    @smooth.setter
+    def smooth(self, smooth):
+        self.__smooth = bool(smooth)
+
+    @property
+    def max_bytes(self):
+        return self.__cache.max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        self.__cache.max_bytes = max_bytes
+
+    @property
+    def stats(self):
+        stats = self.__cache.stats
+        stats['mip_memory'] = sum(surface_bytes(mip) for mips in self.__mips.values() for mip in mips)
+        return stats
+
+
 class Picture:
-    def __init__(self, pygamecontrol, surface, file, x, y, width=None, height=None, style=None, properties=None):
+    # styles every picture has
+    _forced_styles = (IMS_BITMAP,)
+    __slots__ = ('__state', '__state_copy', '__surfaces', '__rects', '__surface_to_draw', '__buffer',
+                 '__cache_states', '__serial', '__token', '__surface_files', '__cached_images', '__x', '__y',
+                 '__pygamecontrol', '__surface', '__forced_styles', '__style', '__properties', '__rect',
+                 '__version', '__drawn_version', '__loading', '__unconverted', '__weakref__')
+
+    # with async_load the images are decoded on the PyGameControls image thread pool, until they are ready the
+    # picture is drawn as a width x height box of the background color
+    # with cache_states the surface drawn for each state is kept in the PyGameControls state cache, so going
+    # back to a state is a blit until the images, rects, style or properties change
+    def __init__(self, pygamecontrol, surface, file, x, y, width=None, height=None, style=None, properties=None,
+                 async_load=False, cache_states=False):
         if not isinstance(surface, pygame.Surface):
             print('second argument, surface, not a valid pygame.Surface')
             raise ValueError
@@ -415,54 +1743,80 @@ class Picture:
 
         self.__state = STATE_NORMAL
         self.__state_copy = STATE_NORMAL
-        self.__surface_normal = None
-        self.__surface_hot = None
-        self.__surface_pressed = None
-        self.__surface_focused = None
-        self.__surface_disabled = None
+        # surface and rect of each state, indexed by state
+        self.__surfaces = [None, None, None, None, None]
+        self.__rects = [pygame.Rect(x, y, width, height), None, None, None, None]
         self.__surface_to_draw = None
+        # redrawn into instead of allocating a new surface every time something changes
+        self.__buffer = None
+        self.__cache_states = cache_states
+        # bumped whenever what the picture looks like changes, older state cache entries are never used again
+        self.__serial = 0
+        self.__token = pygamecontrol._control_token()
         self.__surface_files = []
-        self.__rect_normal = pygame.Rect(x, y, width, height)
+        # images taken from the image cache for each state, given back when replaced or deleted
+        self.__cached_images = [None, None, None, None, None]
         self.__x = x
         self.__y = y
-        self.__rect_hot = None
-        self.__rect_pressed = None
-        self.__rect_focused = None
-        self.__rect_disabled = None
         self.__pygamecontrol = pygamecontrol
         self.__surface = surface
-        self.__forced_styles = [IMS_BITMAP]
-        self.__style = self.__pygamecontrol._check_style(style, [IMS_BITMAP, IMS_REALSIZEIMAGE], self.__forced_styles)
-        self.__properties = properties \
-            if isinstance(properties, ControlProperties) \
-            else ControlProperties('picture', 'flat')
-        self.__properties_copy = self.__properties
-        self.__style_copy = self.__style
+        self.__forced_styles = list(self._forced_styles)
+        self.__style = self.__pygamecontrol._check_style(style, self.__forced_styles + [IMS_REALSIZEIMAGE],
+                                                         self.__forced_styles)
+        self.__properties = self.__pygamecontrol.intern_properties(
+            properties if isinstance(properties, ControlProperties) else ControlProperties('picture', 'flat'))
         self.__rect = None
-        self.__rect_copy = None
-        self.__check_rect = False
-        self.__check_properties = False
-        self.__check_style = False
-
+        # bumped by the properties setter, compared with the version the picture was last drawn with
+        self.__version = 0
+        self.__drawn_version = 0
+        # (file, width, height, [future of the image for each state]) while images are loading in the background
+        self.__loading = None
+        # images were taken from the image cache before there was a display, they're converted by the first
+        # prepare after one is set up
+        self.__unconverted = False
+
+        if isinstance(file, dict) and 'sheet' in file:
+            # {'sheet': image or JSON atlas, 'normal': area or sprite name, 'hot': ..., ...}
+            file = [self.__sprite_path(file['sheet'], file.get(state))
+                    for state in ('normal', 'hot', 'pressed', 'focused', 'disabled')]
         if isinstance(file, dict):
             file = [v for k, v in file.items()]
 
+        image_cache = self.__pygamecontrol._image_cache
+        if async_load and (isinstance(file, str) or isinstance(file, list)):
+            for state in range(STATE_HOT, STATE_HIDDEN):
+                self.__rects[state] = pygame.Rect(x, y, width, height)
+
+            if isinstance(file, str):
+                futures = [self.__pygamecontrol.load_image_async(file) if image_cache.exists(file) else None]
+            else:
+                futures = [self.__pygamecontrol.load_image_async(f) if isinstance(f, str) and image_cache.exists(f)
+                           else None for f in file[:5]]
+            self.__loading = (file, width, height, futures)
+        else:
+            self.__load_files(file, width, height, None)
+
+    def __load_files(self, file, width, height, images):
+        # sets up the state surfaces and rects from file, images are the images already taken from the image
+        # cache for each state when they were loaded in the background
+        x = self.__x
+        y = self.__y
+
         if isinstance(file, str):
-            self.__surface_normal = self.__load_image(file, self.__rect_normal)
-            if self.__surface_normal:
-                self.__surface_hot = self.__surface_normal
-                self.__surface_pressed = self.__surface_normal
-                self.__surface_focused = self.__surface_normal
-                self.__surface_disabled = self.__surface_normal
+            if images:
+                self.__surfaces[STATE_NORMAL] = self.__load_image(images[0], self.__rects[STATE_NORMAL],
+                                                                  STATE_NORMAL)
+                self.__cached_images[STATE_NORMAL] = images[0]
+            else:
+                self.__surfaces[STATE_NORMAL] = self.__load_image(file, self.__rects[STATE_NORMAL], STATE_NORMAL)
+            if self.__surfaces[STATE_NORMAL]:
+                self.__surfaces[STATE_HOT:] = [self.__surfaces[STATE_NORMAL]] * 4
 
                 for i in range(5):
                     self.__surface_files.append(file)
 
-            self.__rect_normal = pygame.Rect(x, y, self.__rect_normal.width, self.__rect_normal.height)
-            self.__rect_hot = pygame.Rect(x, y, self.__rect_normal.width, self.__rect_normal.height)
-            self.__rect_pressed = pygame.Rect(x, y, self.__rect_normal.width, self.__rect_normal.height)
-            self.__rect_focused = pygame.Rect(x, y, self.__rect_normal.width, self.__rect_normal.height)
-            self.__rect_disabled = pygame.Rect(x, y, self.__rect_normal.width, self.__rect_normal.height)
+            size = self.__rects[STATE_NORMAL].size
+            self.__rects[:] = [pygame.Rect((x, y), size) for state in range(5)]
         elif isinstance(file, list):
             surfaces = [None, None, None, None, None]
 
@@ -470,13 +1824,20 @@ class Picture:
                 file.append(None)
 
             for i in range(min(len(surfaces), len(file))):
-                if isinstance(file[i], str) and os.path.isfile(file[i]):
-                    surfaces[i] = pygame.image.load(file[i])
+                if images is not None and images[i]:
+                    surfaces[i] = self.__cached_images[i] = images[i]
+                    self.__surface_files.append(file[i])
+                elif isinstance(file[i], str) and self.__pygamecontrol._image_cache.exists(file[i]) \
+                        and images is None:
+                    surfaces[i] = self.__cached_images[i] = self.__pygamecontrol._image_cache.acquire(file[i])
 
                     if not surfaces[i] and surfaces[0]:
                         surfaces[i] = surfaces[0]
-                elif surfaces[0]:
-                    surfaces[i] = surfaces[0]
+                    self.__surface_files.append(file[i])
+                else:
+                    if surfaces[0]:
+                        surfaces[i] = surfaces[0]
+                    self.__surface_files.append(self.__surface_files[0] if self.__surface_files else None)
 
             if surfaces[0]:
                 get_width = not width
@@ -489,93 +1850,162 @@ class Picture:
                             if get_height:
                                 height = max(height, surface.get_height())
 
-                self.__rect_normal = pygame.Rect(x, y, width, height)
-                self.__rect_hot = pygame.Rect(x, y, width, height)
-                self.__rect_pressed = pygame.Rect(x, y, width, height)
-                self.__rect_focused = pygame.Rect(x, y, width, height)
-                self.__rect_disabled = pygame.Rect(x, y, width, height)
-                self.__surface_normal = self.__proper_surface(surfaces[0], self.__rect_normal)
-                self.__surface_hot = self.__proper_surface(surfaces[1], self.__rect_hot)
-                self.__surface_pressed = self.__proper_surface(surfaces[2], self.__rect_pressed)
-                self.__surface_focused = self.__proper_surface(surfaces[3], self.__rect_focused)
-                self.__surface_disabled = self.__proper_surface(surfaces[4], self.__rect_disabled)
+                self.__rects[:] = [pygame.Rect(x, y, width, height) for state in range(5)]
+                self.__surfaces[:] = [self.__proper_surface(surfaces[state], self.__rects[state])
+                                      for state in range(5)]
             elif not (width or height):
                 print('cannot supply an empty array of images with no default width, height')
-                raise ValueError
+                if images is None:
+                    raise ValueError
+        self.__check_converted()
+
+    @staticmethod
+    def __sprite_path(sheet, sprite):
+        # image cache path of a sprite on sheet, sprite being a sprite name or an (x, y, width, height) area
+        if sprite is None:
+            return None
+        if isinstance(sprite, str):
+            return sheet + '#' + sprite
+        return sheet + '#' + ','.join(str(int(v)) for v in sprite)
+
+    def __finish_loading(self):
+        # swaps in the images loaded in the background once all of them are ready
+        file, width, height, futures = self.__loading
+        if not all(future.done() for future in futures if future):
+            return False
+
+        self.__loading = None
+        # the images were only decoded, they're converted and put in the cache here on the thread drawing
+        image_cache = self.__pygamecontrol._image_cache
+        files = [file] if isinstance(file, str) else file
+        images = [image_cache.acquire(files[i], future.result()) if future else None
+                  for i, future in enumerate(futures)]
+        images += [None] * (5 - len(images))
+        self.__load_files(file, width, height, images)
+        self.__surface_to_draw = None
+        self.__serial += 1
+        self.__pygamecontrol._control_moved(self)
+        return True
 
     def draw(self):
+        prepared = self.prepare()
+        if prepared:
+            self.__surface.blit(prepared[0], prepared[1])
+
+    def prepare(self):
+        # builds the surface to draw if something changed and returns (surface to draw, rect) without drawing it,
+        # None when there's nothing to draw
         if self.__state == STATE_HIDDEN:
-            return
+            return None
 
-        if self.__check_properties or self.__check_rect or self.__check_style:
-            if self.__properties != self.__properties_copy \
-                    or self.__rect != self.__rect_copy \
-                    or self.__style != self.__style_copy \
-                    or self.__state != self.__state_copy:
-                self.__surface_to_draw = self.__rect = self.__rect_copy = None
+        if self.__loading and not self.__finish_loading():
+            return self.__placeholder()
+
+        if self.__unconverted and pygame.display.get_surface():
+            self.__convert_images()
+
+        if self.__version != self.__drawn_version:
+            self.__surface_to_draw = self.__rect = None
+            # the properties were set
+            self.__serial += 1
             self.__state_copy = self.__state
-            self.__check_properties = self.__check_rect = self.__check_style = False
+            self.__drawn_version = self.__version
 
         if not self.__surface_to_draw:
-            if self.__state == STATE_NORMAL:
-                if self.__surface_normal:
-                    self.__rect = self.__rect_normal
-                    surface = self.__surface_normal
-                    bk_color = self.__properties.bk_color_normal
-                    border_color = self.__properties.border_color_normal
-            elif self.__state == STATE_HOT:
-                if self.__surface_hot:
-                    self.__rect = self.__rect_hot
-                    surface = self.__surface_hot
-                    bk_color = self.__properties.bk_color_hot
-                    border_color = self.__properties.border_color_hot
-            elif self.__state == STATE_PRESSED:
-                if self.__surface_pressed:
-                    self.__rect = self.__rect_pressed
-                    surface = self.__surface_pressed
-                    bk_color = self.__properties.bk_color_pressed
-                    border_color = self.__properties.border_color_pressed
-            elif self.__state == STATE_FOCUSED:
-                if self.__surface_focused:
-                    self.__rect = self.__rect_focused
-                    surface = self.__surface_focused
-                    bk_color = self.__properties.bk_color_focused
-                    border_color = self.__properties.border_color_focused
-            elif self.__state == STATE_DISABLED:
-                if self.__surface_disabled:
-                    self.__rect = self.__rect_disabled
-                    surface = self.__surface_disabled
-                    bk_color = self.__properties.bk_color_disabled
-                    border_color = self.__properties.border_color_disabled
-            else:
+            if not STATE_NORMAL <= self.__state <= STATE_DISABLED:
                 print('invalid state for Picture')
                 raise ValueError
+            surface = self.__surfaces[self.__state]
+            if not surface:
+                return None
+            self.__rect = self.__rects[self.__state]
+            bk_color = self.__properties.bk_colors[self.__state]
+            border_color = self.__properties.border_colors[self.__state]
 
-            self.__surface_to_draw = pygame.Surface((self.__rect.width, self.__rect.height), pygame.SRCALPHA)
-
-            if bk_color[3]:
-                bg = pygame.Surface((self.__rect.width, self.__rect.height), pygame.SRCALPHA)
-                bg.fill(bk_color)
-                bg.set_alpha(bk_color[3], pygame.RLEACCEL)
-                self.__surface_to_draw.blit(bg, (0, 0))
-                del bg
+            self.__state_copy = self.__state
 
-            self.__surface_to_draw.blit(surface,
-                                        pygame.Rect(self.__rect.x - self.__x, self.__rect.y - self.__y,
-                                                    self.__rect.width,
-                                                    self.__rect.height))
+            state_key = (self.__token, self.__serial, self.__state)
+            cached = self.__pygamecontrol._state_cache.get(state_key) if self.__cache_states else None
+            if cached:
+                self.__surface_to_draw = cached
+            else:
+                # blitted every frame, kept in the display pixel format
+                # cached surfaces are kept, they get a surface of their own instead of the buffer
+                if self.__cache_states:
+                    self.__surface_to_draw = self.__pygamecontrol._scratch_surface(
+                        None, self.__rect.size, self.__pygamecontrol.convert_images)
+                else:
+                    self.__buffer = self.__pygamecontrol._scratch_surface(self.__buffer, self.__rect.size,
+                                                                          self.__pygamecontrol.convert_images)
+                    self.__surface_to_draw = self.__buffer
+
+                self.__pygamecontrol.draw_background(self.__surface_to_draw, self.__properties, self.__state,
+                                                     bk_color, self.__rect)
+
+                self.__surface_to_draw.blit(surface,
+                                            pygame.Rect(self.__rect.x - self.__x, self.__rect.y - self.__y,
+                                                        self.__rect.width,
+                                                        self.__rect.height))
+
+                self.__pygamecontrol._draw_style_overlay(self.__surface_to_draw, self.__properties, self.__style,
+                                                         bk_color, border_color, self.__rect)
+
+                if self.__cache_states:
+                    self.__pygamecontrol._state_cache.put(state_key, self.__surface_to_draw)
+
+        return self.__surface_to_draw, self.__rect
+
+    def __check_converted(self):
+        if self.__pygamecontrol.convert_images and not pygame.display.get_surface():
+            self.__unconverted = True
+
+    def __convert_images(self):
+        self.__unconverted = False
+        image_cache = self.__pygamecontrol._image_cache
+        # id of each image before it was converted -> (that image, the converted one)
+        converted = dict()
+        for state, image in enumerate(self.__cached_images):
+            if image:
+                converted[id(image)] = (image, image_cache.convert(image))
+                self.__cached_images[state] = converted[id(image)][1]
+
+        # the state surfaces may be scaled copies of the images, they're made again from the converted images
+        scaled_images = self.__pygamecontrol._scaled_images
+        changed = False
+        for state, surface in enumerate(self.__surfaces):
+            images = converted.get(id(scaled_images.source(surface))) if surface else None
+            if images and images[0] is not images[1]:
+                self.__surfaces[state] = self.__proper_surface(images[1], self.__rects[state])
+                changed = True
+        if changed:
+            self.__surface_to_draw = None
+            self.__serial += 1
 
-            self.__rect_copy = self.__rect
+    def __placeholder(self):
+        rect = self.__state_rect()
+        if not rect or not rect.width or not rect.height:
+            return None
 
-            self.__pygamecontrol.draw_style(self.__surface_to_draw, self.__properties, self.__style,
-                                            bk_color, border_color, self.__rect)
+        if not self.__surface_to_draw or self.__surface_to_draw.get_size() != rect.size \
+                or self.__state != self.__state_copy:
+            bk_color = self.__properties.bk_colors[self.__state]
+            self.__buffer = self.__pygamecontrol._scratch_surface(self.__buffer, rect.size)
+            self.__buffer.fill(bk_color)
+            self.__surface_to_draw = self.__buffer
+            self.__state_copy = self.__state
+        return self.__surface_to_draw, rect
 
-        self.__surface.blit(self.__surface_to_draw, self.__rect)
+    def __load_image(self, file, rect, state):
+        image_cache = self.__pygamecontrol._image_cache
+        if self.__cached_images[state]:
+            image_cache.release(self.__cached_images[state])
+            self.__cached_images[state] = None
 
-    def __load_image(self, file, rect):
         if isinstance(file, str):
-            if os.path.isfile(file):
-                surface = pygame.image.load(file)
+            if image_cache.exists(file):
+                surface = self.__cached_images[state] = image_cache.acquire(file)
+                if not surface:
+                    return None
             else:
                 print('error loading image:', file, '\nfile does not exist')
                 return None
@@ -594,7 +2024,7 @@ class Picture:
     def __proper_surface(self, surface, rect):
         if IMS_REALSIZECONTROL in self.__style:
             if rect.width and rect.height:
-                surface = pygame.transform.scale(surface, (rect.width, rect.height))
+                surface = self.__pygamecontrol._scaled_images.scale(surface, (rect.width, rect.height))
             else:
                 return surface
         elif IMS_REALSIZEIMAGE in self.__style:
@@ -612,6 +2042,15 @@ class Picture:
 
         return surface
 
+    def __del__(self):
+        try:
+            image_cache = self.__pygamecontrol._image_cache
+            for image in self.__cached_images:
+                if image:
+                    image_cache.release(image)
+        except AttributeError:
+            pass
+
     def move_surface(self, x=None, y=None, width=None, height=None):
         if isinstance(x, str) or isinstance(x, float):
             x = int(x)
@@ -621,56 +2060,44 @@ class Picture:
             width = int(width)
         if isinstance(height, str) or isinstance(height, float):
             height = int(height)
-        if x is not None:
-            self.__rect_normal.x = x
-            self.__rect_hot.x = x
-            self.__rect_pressed.x = x
-            self.__rect_focused.x = x
-            self.__rect_disabled.x = x
-        if y is not None:
-            self.__rect_normal.y = y
-            self.__rect_hot.y = y
-            self.__rect_pressed.y = y
-            self.__rect_focused.y = y
-            self.__rect_disabled.y = y
-        if width is not None:
-            self.__rect_normal.width = width
-            self.__rect_hot.width = width
-            self.__rect_pressed.width = width
-            self.__rect_focused.width = width
-            self.__rect_disabled.width = width
-        if height is not None:
-            self.__rect_normal.height = height
-            self.__rect_hot.height = height
-            self.__rect_pressed.height = height
-            self.__rect_focused.height = height
-            self.__rect_disabled.height = height
+        for rect in self.__rects:
+            if rect is None:
+                continue
+            if x is not None:
+                rect.x = x
+            if y is not None:
+                rect.y = y
+            if width is not None:
+                rect.width = width
+            if height is not None:
+                rect.height = height
+        if width is not None or height is not None:
+            self.__surface_to_draw = None
+            self.__serial += 1
         if not (x is None or y is None or width is None or height is None):
-            self.__surface_normal = self.__proper_surface(self.__surface_normal, self.__rect_normal)
-            self.__surface_hot = self.__proper_surface(self.__surface_hot, self.__rect_hot)
-            self.__surface_pressed = self.__proper_surface(self.__surface_pressed, self.__rect_pressed)
-            self.__surface_focused = self.__proper_surface(self.__surface_focused, self.__rect_focused)
-            self.__surface_disabled = self.__proper_surface(self.__surface_disabled, self.__rect_disabled)
+            self.__surfaces[:] = [self.__proper_surface(surface, rect)
+                                  for surface, rect in zip(self.__surfaces, self.__rects)]
+        self.__pygamecontrol._control_moved(self)
 
     @property
     def surface_normal(self):
-        return self.__surface_normal
+        return self.__surfaces[STATE_NORMAL]
 
     @property
     def surface_hot(self):
-        return self.__surface_hot
+        return self.__surfaces[STATE_HOT]
 
     @property
     def surface_pressed(self):
-        return self.__surface_pressed
+        return self.__surfaces[STATE_PRESSED]
 
     @property
     def surface_focused(self):
-        return self.__surface_focused
+        return self.__surfaces[STATE_FOCUSED]
 
     @property
     def surface_disabled(self):
-        return self.__surface_disabled
+        return self.__surfaces[STATE_DISABLED]
 
     @property
     def file_normal(self):
@@ -694,57 +2121,379 @@ class Picture:
 
     @property
     def style(self):
-        self.__check_style = True
         return self.__style
 
     @property
     def properties(self):
-        self.__check_properties = True
         return self.__properties
 
+    @properties.setter
+    def properties(self, properties):
+        if isinstance(properties, ControlProperties) and self.__properties != properties:
+            self.__properties = self.__pygamecontrol.intern_properties(properties)
+            self.__version += 1
+
+    @style.setter
+    def style(self, style):
+        style = self.__pygamecontrol._check_style(style, self.__style, self.__forced_styles)
+        if style != self.__style:
+            self.__style = style
+            # the state surfaces are made again from the images, not from copies scaled for the old style,
+            # the picture stays where it is
+            scaled_images = self.__pygamecontrol._scaled_images
+            for state, surface in enumerate(self.__surfaces):
+                rect = self.__rects[state]
+                if surface and rect:
+                    position = rect.topleft
+                    self.__surfaces[state] = self.__proper_surface(scaled_images.source(surface), rect)
+                    rect.topleft = position
+            self.__version += 1
+            self.__pygamecontrol._control_moved(self)
+
     @property
     def state(self):
         return self.__state
 
+    @property
+    def surface(self):
+        return self.__surface
+
+    @property
+    def draw_rect(self):
+        # where the picture is drawn on its surface, unlike the style and properties getters this doesn't make
+        # the picture check itself for changes on the next draw
+        if self.__state == STATE_HIDDEN:
+            return None
+        rect = self.__rect or self.__state_rect()
+        return pygame.Rect(rect) if rect else None
+
+    @property
+    def dirty(self):
+        # True when the next draw will draw something different from the last one
+        return not self.__surface_to_draw \
+            or self.__version != self.__drawn_version \
+            or self.__state != self.__state_copy \
+            or (self.__loading is not None and all(future.done() for future in self.__loading[3] if future))
+
+    @property
+    def loading(self):
+        # True while the images of an async_load picture are still being decoded
+        return self.__loading is not None
+
+    @property
+    def cache_states(self):
+        return self.__cache_states
+
+    @cache_states.setter
+    def cache_states(self, cache_states):
+        self.__cache_states = cache_states
+
+    def _set_frame(self, surface):
+        # shows surface in every state, Animation's frames, surface doesn't come from the image cache here
+        if not self.__rects[STATE_HOT]:
+            # first frame of a picture created without images
+            if not self.__rects[STATE_NORMAL].width:
+                self.__rects[STATE_NORMAL].width = surface.get_width()
+            if not self.__rects[STATE_NORMAL].height:
+                self.__rects[STATE_NORMAL].height = surface.get_height()
+            self.__rects[STATE_HOT:] = [pygame.Rect(self.__rects[STATE_NORMAL]) for state in range(4)]
+
+        size = self.__rects[STATE_NORMAL].size
+        self.__surfaces[:] = [self.__proper_surface(surface, rect) for rect in self.__rects]
+        self.__surface_to_draw = None
+        self.__serial += 1
+        if self.__rects[STATE_NORMAL].size != size:
+            self.__pygamecontrol._control_moved(self)
+
+    def __state_rect(self):
+        if STATE_NORMAL <= self.__state <= STATE_DISABLED:
+            return self.__rects[self.__state]
+        return None
+
     @state.setter
     def state(self, state):
         if self.__state != state:
             self.__state = state
+            self.__surface_to_draw = None
+            self.__pygamecontrol._control_moved(self)
+
+    @surface.setter
+    def surface(self, surface):
+        if isinstance(surface, pygame.Surface):
+            self.__surface = surface
+
+    def __set_surface(self, state, file):
+        self.__surfaces[state] = self.__load_image(file, self.__rects[state], state)
+        self.__check_converted()
+        self.__serial += 1
+        self.__pygamecontrol._control_moved(self)
+        if self.__state_copy == state:
+            self.__surface_to_draw = None
 
     @surface_normal.setter
     def surface_normal(self, file):
-        self.__surface_normal = self.__load_image(file, self.__rect_normal)
-        if self.__state_copy == STATE_NORMAL:
-            self.__surface_to_draw = None
+        self.__set_surface(STATE_NORMAL, file)
 
     @surface_hot.setter
     def surface_hot(self, file):
-        self.__surface_hot = self.__load_image(file, self.__rect_hot)
-        if self.__state_copy == STATE_HOT:
-            self.__surface_to_draw = None
+        self.__set_surface(STATE_HOT, file)
 
     @surface_pressed.setter
     def surface_pressed(self, file):
-        self.__surface_pressed = self.__load_image(file, self.__rect_pressed)
-        if self.__state_copy == STATE_PRESSED:
-            self.__surface_to_draw = None
+        self.__set_surface(STATE_PRESSED, file)
 
     @surface_focused.setter
     def surface_focused(self, file):
-        self.__surface_focused = self.__load_image(file, self.__rect_focused)
-        if self.__state_copy == STATE_FOCUSED:
-            self.__surface_to_draw = None
+        self.__set_surface(STATE_FOCUSED, file)
 
     @surface_disabled.setter
     def surface_disabled(self, file):
-        self.__surface_disabled = self.__load_image(file, self.__rect_disabled)
-        if self.__state_copy == STATE_DISABLED:
-            self.__surface_to_draw = None
+        self.__set_surface(STATE_DISABLED, file)
+
+
+class FrameBuffer(object):
+    # the frames of an Animation, loaded once, from
+    #   a list of image files (or sprites, see ImageCache)
+    #   a file pattern such as 'walk_*.png', frames in natural order ('walk_2' before 'walk_10')
+    #   a JSON atlas, every sprite in it in name order
+    #   a GIF, decoded with PIL along with the time of each frame
+    #   {'sheet': image, 'frame_size': (width, height)}, the sheet cut into frames left to right, top to bottom
+    #   {'sheet': image or JSON atlas, 'frames': [area or sprite name, ...]}
+    # images from files are taken from the image cache and given back when the buffer is deleted
+    def __init__(self, image_cache, frames):
+        self.__image_cache = image_cache
+        self.__frames = []
+        # milliseconds for each frame, None for the animation's frame_time
+        self.__durations = []
+        self.__cached = []
+        # the frames are converted to the display's pixel format on first use when there's no display yet
+        self.__unconverted = not pygame.display.get_surface()
+
+        if isinstance(frames, str) and frames.lower().endswith('.gif'):
+            self.__load_gif(frames)
+            return
+
+        if isinstance(frames, dict) and 'sheet' in frames:
+            files = self.__sheet_frames(frames)
+        elif isinstance(frames, str):
+            if frames.lower().endswith('.json') and '#' not in frames:
+                files = image_cache.sprites(frames)
+            elif glob.has_magic(frames):
+                files = sorted(glob.glob(frames), key=natural_key)
+            else:
+                files = [frames]
+        elif isinstance(frames, list) or isinstance(frames, tuple):
+            files = frames
+        else:
+            print('frames for FrameBuffer not a file, pattern, list or sprite sheet,', frames)
+            raise ValueError
+
+        for file in files:
+            image = image_cache.acquire(file)
+            if image:
+                self.__cached.append(image)
+                self.__frames.append(image)
+                self.__durations.append(None)
+            else:
+                print('error loading frame:', file)
+
+    def __sheet_frames(self, frames):
+        sheet = frames['sheet']
+        if 'frames' in frames:
+            return [sheet + '#' + (frame if isinstance(frame, str) else ','.join(str(int(v)) for v in frame))
+                    for frame in frames['frames']]
+
+        width, height = frames['frame_size']
+        image = self.__image_cache.acquire(sheet)
+        if not image:
+            return []
+        sheet_width, sheet_height = image.get_size()
+        self.__image_cache.release(image)
+        return ['%s#%d,%d,%d,%d' % (sheet, x, y, width, height)
+                for y in range(0, sheet_height - height + 1, height)
+                for x in range(0, sheet_width - width + 1, width)]
+
+    def __load_gif(self, file):
+        try:
+            with Image.open(file) as gif:
+                for frame in ImageSequence.Iterator(gif):
+                    rgba = frame.convert('RGBA')
+                    image = pygame.image.fromstring(rgba.tobytes(), rgba.size, 'RGBA')
+                    self.__frames.append(PyGameControls._display_format(image))
+                    self.__durations.append(frame.info.get('duration') or None)
+        except OSError as e:
+            print('error loading frames:', file, e)
+
+    def __del__(self):
+        try:
+            for image in self.__cached:
+                self.__image_cache.release(image)
+        except AttributeError:
+            pass
+
+    def __len__(self):
+        return len(self.__frames)
+
+    def __getitem__(self, index):
+        if self.__unconverted:
+            self.__convert()
+        return self.__frames[index]
+
+    def __convert(self):
+        if not pygame.display.get_surface():
+            return
+        self.__unconverted = False
+        if self.__cached:
+            # the frames are the images taken from the image cache
+            self.__cached = [self.__image_cache.convert(image) for image in self.__cached]
+            self.__frames = list(self.__cached)
+        else:
+            self.__frames = [PyGameControls._display_format(frame) for frame in self.__frames]
+
+    def duration(self, index, frame_time):
+        return self.__durations[index] or frame_time
+
+    @property
+    def frames(self):
+        if self.__unconverted:
+            self.__convert()
+        return self.__frames
+
+    @property
+    def durations(self):
+        return self.__durations
+
+
+class Animation(Picture):
+    # a Picture that plays the frames of a FrameBuffer, frames are advanced by PyGameControls.tick
+    # frame_time is the milliseconds each frame shows for unless the frames (GIFs) have their own times
+    _forced_styles = (IMS_BITMAP, IMS_ANIMATION)
+    __slots__ = ('__pygamecontrol', '__frames', '__frame', '__frame_time', '__loop', '__playing', '__serial')
+
+    def __init__(self, pygamecontrol, surface, frames, x, y, width=None, height=None, style=None, properties=None,
+                 frame_time=100, loop=True, playing=True):
+        properties = properties if isinstance(properties, ControlProperties) else ControlProperties('animation')
+        super().__init__(pygamecontrol, surface, None, x, y, width, height, style, properties)
+
+        self.__pygamecontrol = pygamecontrol
+        self.__frames = frames if isinstance(frames, FrameBuffer) else pygamecontrol.frame_buffer(frames)
+        self.__frame = 0
+        self.__frame_time = max(int(frame_time), 1)
+        self.__loop = loop
+        self.__playing = False
+        # bumped on every stop or seek so the scheduler drops the frame it had queued
+        self.__serial = 0
+
+        if len(self.__frames):
+            self._set_frame(self.__frames[0])
+        if playing:
+            self.play()
+
+    def play(self):
+        # the next frame is due frame_time after the time of the last PyGameControls.tick, or after
+        # pygame.time.get_ticks() when tick hasn't been called yet
+        if self.__playing or len(self.__frames) < 2:
+            return
+        self.__playing = True
+        self.__schedule(self.__pygamecontrol._now())
+
+    def stop(self):
+        self.__playing = False
+        self.__serial += 1
+
+    def __schedule(self, now):
+        self.__serial += 1
+        self.__pygamecontrol._schedule_animation(self, now + self.__duration(), self.__serial)
+
+    def __duration(self):
+        return max(self.__frames.duration(self.__frame, self.__frame_time), 1)
+
+    def _advance(self, due, now, serial):
+        # called by PyGameControls.tick once the current frame has shown long enough, catches up on every
+        # frame that should have shown since, True when the frame changed
+        if serial != self.__serial or not self.__playing:
+            return False
+
+        count = len(self.__frames)
+        frame = self.__frame
+        if self.__loop and now - due > sum(self.__frames.duration(i, self.__frame_time) for i in range(count)):
+            # behind by more than a whole loop, don't step through every frame
+            due = now
+
+        while due <= now:
+            if frame + 1 < count:
+                frame += 1
+            elif self.__loop:
+                frame = 0
+            else:
+                self.__playing = False
+                break
+            due += max(self.__frames.duration(frame, self.__frame_time), 1)
+
+        if self.__playing:
+            self.__serial += 1
+            self.__pygamecontrol._schedule_animation(self, due, self.__serial)
+        return self.__show(frame)
+
+    def __show(self, frame):
+        previous = self.__frames[self.__frame]
+        self.__frame = frame
+        if self.__frames[frame] is previous:
+            return False
+        self._set_frame(self.__frames[frame])
+        return True
+
+    @property
+    def frame(self):
+        return self.__frame
+
+    @frame.setter
+    def frame(self, frame):
+        if not len(self.__frames):
+            return
+        self.__show(int(frame) % len(self.__frames))
+        if self.__playing:
+            self.__schedule(self.__pygamecontrol._now())
+
+    @property
+    def frame_count(self):
+        return len(self.__frames)
+
+    @property
+    def frames(self):
+        return self.__frames
+
+    @property
+    def frame_time(self):
+        return self.__frame_time
+
+    @frame_time.setter
+    def frame_time(self, frame_time):
+        self.__frame_time = max(int(frame_time), 1)
+
+    @property
+    def loop(self):
+        return self.__loop
+
+    @loop.setter
+    def loop(self, loop):
+        self.__loop = loop
+
+    @property
+    def playing(self):
+        return self.__playing
 
 
 class Label:
+    # with cache_states the surface drawn for each state is kept in the PyGameControls state cache, so going
+    # back to a state is a blit until the text, font, rect, style or properties change
+    __slots__ = ('__pygamecontrol', '__surface', '__text', '__forced_styles', '__style', '__y_offset',
+                 '__properties', '__x_offset', '__text_renderer', '__font', '__rect', '__surface_to_draw', '__buffer',
+                 '__cache_states', '__serial', '__token', '__version', '__state', '__client_rect', '__text_to_draw',
+                 '__laid_out_version', '__laid_out_font', '__laid_out_rect', '__weakref__')
+
     def __init__(self, pygamecontrol, surface, text, x, y, width=None, height=None, style=None, properties=None,
-                 font=None):
+                 font=None, text_renderer=None, cache_states=False):
         if not isinstance(surface, pygame.Surface):
             print('second argument, surface, not a valid pygame.Surface')
             raise ValueError
@@ -773,15 +2522,21 @@ class Label:
         self.__forced_styles = None
         self.__style = self.__pygamecontrol._check_style(style, [TS_LEFT, TS_TOP], self.__forced_styles)
         self.__y_offset = 0
-        self.__properties = properties \
-            if isinstance(properties, ControlProperties) else \
+        self.__properties = self.__pygamecontrol.intern_properties(
+            properties if isinstance(properties, ControlProperties) else
             ControlProperties('label', 'flat',
                               text_color_normal=(0, 0, 0, 255),
-                              text_color_disabled=(150, 150, 150, 255))
+                              text_color_disabled=(150, 150, 150, 255)))
 
         self.__x_offset = 1
         self.__y_offset = 0
 
+        if text_renderer is not None and text_renderer not in SUPPORTED_TEXT_RENDERERS:
+            print('text_renderer not a supported renderer,', text_renderer)
+            raise ValueError
+        # None uses the renderer set on the PyGameControls
+        self.__text_renderer = text_renderer
+
         if isinstance(font, Font):
             self.__font = font
         elif isinstance(font, str):
@@ -791,69 +2546,103 @@ class Label:
 
         self.__rect = pygame.Rect(x, y, width, height)
         self.__surface_to_draw = None
-        self.__client_rect = self.client_rect()
-        self.__text_to_draw = self.__pygamecontrol._format_text(self.__text,
-                                                                self.__font.pygame_font,
-                                                                self.__client_rect,
-                                                                self.__style).splitlines()
-        self.__font_copy = copy.copy(self.__font)
-        self.__rect_copy = copy.copy(self.__rect)
-        self.__style_copy = copy.copy(self.__style)
-        self.__properties_copy = copy.copy(self.__properties)
-        self.__y_offset_copy = copy.copy(self.__y_offset)
-        self.__check_font = False
-        self.__check_rect = False
-        self.__check_style = False
-        self.__check_properties = False
+        # redrawn into instead of allocating a new surface every time something changes
+        self.__buffer = None
+        self.__cache_states = cache_states
+        # bumped whenever what the label looks like changes, older state cache entries are never used again
+        self.__serial = 0
+        self.__token = pygamecontrol._control_token()
+        # bumped by the text, style, font, properties and rect setters, the font has a version of its own and the
+        # rect can be changed in place so it's compared with where the label was laid out
+        self.__version = 0
         self.__state = STATE_NORMAL
+        self.__layout()
 
     @property
     def surface(self):
         return self.__surface
 
+    @property
+    def draw_rect(self):
+        # where the label is drawn on its surface, unlike the rect getter this doesn't make the label check
+        # itself for changes on the next draw
+        if self.__state == STATE_HIDDEN:
+            return None
+        return pygame.Rect(self.__rect)
+
+    @property
+    def dirty(self):
+        # True when the next draw will draw something different from the last one
+        return not self.__surface_to_draw or self.__changed()
+
     @property
     def text(self):
         return self.__text
 
     @property
     def text_to_draw(self):
+        self.__check_layout()
         return self.__text_to_draw
 
     @property
     def style(self):
-        self.__check_style = True
         return self.__style
 
     @property
     def font(self):
-        self.__check_font = True
         return self.__font
 
     @property
     def properties(self):
-        self.__check_properties = True
         return self.__properties
 
     @property
     def rect(self):
-        self.__check_rect = True
+        # the rect can be changed in place
+        self.__pygamecontrol._control_moved(self)
         return self.__rect
 
     @property
     def state(self):
         return self.__state
 
+    @property
+    def text_renderer(self):
+        return self.__text_renderer
+
+    @property
+    def cache_states(self):
+        return self.__cache_states
+
+    @cache_states.setter
+    def cache_states(self, cache_states):
+        self.__cache_states = cache_states
+
+    @text_renderer.setter
+    def text_renderer(self, text_renderer):
+        if text_renderer is not None and text_renderer not in SUPPORTED_TEXT_RENDERERS:
+            print('text_renderer not a supported renderer,', text_renderer)
+            raise ValueError
+        if text_renderer != self.__text_renderer:
+            self.__text_renderer = text_renderer
+            self.__surface_to_draw = None
+            self.__serial += 1
+
     @text.setter
     def text(self, text):
         text = self.__proper_text(text)
+        # setting the text the label already shows keeps its surface and cached states
+        if text == self.__text:
+            return
         if not text:
             self.__text = ''
             self.__text_to_draw = []
-        if isinstance(text, str) and self.__text != text:
+        else:
             self.__text = text
-            self.__text_to_draw = self.__pygamecontrol._format_text(text, self.__font.pygame_font, self.__client_rect,
-                                                                    self.__style).splitlines()
+            # laid out when it's next needed, with the rect, style and font the label has then
+            self.__version += 1
         self.__surface_to_draw = None
+        self.__serial += 1
 
     @surface.setter
     def surface(self, surface):
@@ -865,26 +2654,27 @@ class Label:
         style = self.__pygamecontrol._check_style(style, self.__style, self.__forced_styles)
         if style != self.__style:
             self.__style = style
-            self.__check_style = True
+            self.__version += 1
 
     @font.setter
     def font(self, font):
         if isinstance(font, Font) and self.__font != font:
             self.__font = font
-            self.__check_font = True
+            self.__version += 1
 
     @properties.setter
     def properties(self, properties):
-        if isinstance(property, ControlProperties) and self.__properties != properties:
-            self.__properties = properties
-            self.__check_properties = True
+        if isinstance(properties, ControlProperties) and self.__properties != properties:
+            self.__properties = self.__pygamecontrol.intern_properties(properties)
+            self.__version += 1
 
     @rect.setter
     def rect(self, rect):
         if isinstance(rect, pygame.Rect):
             if rect != self.__rect:
                 self.__rect = rect
-                self.__check_rect = True
+                self.__version += 1
+                self.__pygamecontrol._control_moved(self)
 
     @state.setter
     def state(self, state):
@@ -894,6 +2684,7 @@ class Label:
             if state != self.__state:
                 self.__state = state
                 self.__surface_to_draw = None
+                self.__pygamecontrol._control_moved(self)
 
     def __proper_text(self, text):
         if isinstance(text, list) or isinstance(text, tuple):
@@ -904,7 +2695,28 @@ class Label:
             return ''
         return text
 
+    def __changed(self):
+        # a few integer compares instead of comparing copies of everything the label was laid out with
+        return self.__version != self.__laid_out_version or self.__font.version != self.__laid_out_font \
+            or self.__rect != self.__laid_out_rect
+
+    def __check_layout(self):
+        if self.__changed():
+            self.__layout()
+            self.__surface_to_draw = None
+            self.__serial += 1
+
+    def __layout(self):
+        self.__client_rect = self.client_rect()
+        self.__text_to_draw = self.__pygamecontrol._layout_text(self.__text, self.__font, self.__client_rect,
+                                                                self.__style)
+        self.__laid_out_version = self.__version
+        self.__laid_out_font = self.__font.version
+        self.__laid_out_rect = tuple(self.__rect)
+
     def client_rect(self):
+        self.__x_offset = 1
+        self.__y_offset = 0
         if self.__properties.px_border:
             self.__y_offset = self.__properties.px_border + 1
             self.__x_offset = self.__properties.px_border + 1
@@ -921,74 +2733,43 @@ class Label:
                            self.__rect.width - (self.__x_offset * 2), self.__rect.height - (self.__y_offset * 2))
 
     def draw(self):
+        prepared = self.prepare()
+        if not prepared:
+            return None
+        self.__surface.blit(prepared[0], prepared[1])
+        return True
+
+    def prepare(self):
+        # builds the surface to draw if something changed and returns (surface to draw, rect) without drawing it,
+        # None when there's nothing to draw
         if self.__state == STATE_HIDDEN:
-            return
+            return None
 
-        if self.__check_font or self.__check_properties or self.__check_rect or self.__check_style or self.__y_offset != self.__y_offset_copy:
-            if self.__font != self.__font_copy \
-                    or self.__properties != self.__properties_copy \
-                    or self.__rect != self.__rect_copy \
-                    or self.__style != self.__style_copy \
-                    or self.__y_offset != self.__y_offset_copy:
-                if self.__font != self.__font_copy or self.__rect != self.__rect_copy or self.__style != self.__style_copy:
-                    self.__text_to_draw = self.__pygamecontrol._format_text(self.__text,
-                                                                            self.__font.pygame_font,
-                                                                            self.__client_rect,
-                                                                            self.__style).splitlines()
-
-                    if self.__font != self.__font_copy:
-                        self.__font_copy = self.__font
-                    if self.__rect != self.__rect_copy:
-                        self.__rect_copy = self.__rect
-                    if self.__style != self.__style_copy:
-                        self.__style_copy = self.__style
-
-                if self.__properties != self.__properties_copy:
-                    self.__properties_copy = self.__properties
-                if self.__y_offset != self.__y_offset_copy:
-                    self.__y_offset_copy = self.__y_offset
+        self.__check_layout()
 
-                self.__surface_to_draw = None
-                self.__client_rect = self.client_rect()
-            self.__check_font = self.__check_properties = \
-                self.__check_rect = self.__check_style = \
-                self.__y_offset = self.__y_offset_copy = False
+        state_key = (self.__token, self.__serial, self.__state)
+        if not self.__surface_to_draw and self.__cache_states:
+            self.__surface_to_draw = self.__pygamecontrol._state_cache.get(state_key)
 
         if not self.__surface_to_draw:
             # If something has changed it will set the last_text_surface to none
             # Only redraw the surface if something has changed
-            self.__surface_to_draw = pygame.Surface((self.__rect.width, self.__rect.height), pygame.SRCALPHA)
-
-            if self.__state == STATE_NORMAL:
-                text_color = self.__properties.text_color_normal
-                bk_color = self.__properties.bk_color_normal
-                border_color = self.__properties_copy.border_color_normal
-            elif self.__state == STATE_HOT:
-                text_color = self.__properties.text_color_hot
-                bk_color = self.__properties.bk_color_hot
-                border_color = self.__properties_copy.border_color_hot
-            elif self.__state == STATE_PRESSED:
-                text_color = self.__properties.text_color_pressed
-                bk_color = self.__properties.bk_color_pressed
-                border_color = self.__properties_copy.border_color_pressed
-            elif self.__state == STATE_FOCUSED:
-                text_color = self.__properties.text_color_focused
-                bk_color = self.__properties.bk_color_focused
-                border_color = self.__properties_copy.border_color_focused
-            elif self.__state == STATE_DISABLED:
-                text_color = self.__properties.text_color_disabled
-                bk_color = self.__properties.bk_color_disabled
-                border_color = self.__properties_copy.border_color_disabled
+            if self.__cache_states:
+                # cached surfaces are kept, they get a surface of their own instead of the buffer
+                self.__surface_to_draw = self.__pygamecontrol._scratch_surface(None, self.__rect.size)
             else:
+                self.__buffer = self.__pygamecontrol._scratch_surface(self.__buffer, self.__rect.size)
+                self.__surface_to_draw = self.__buffer
+
+            if not STATE_NORMAL <= self.__state <= STATE_DISABLED:
                 print('invalid state')
                 raise ValueError
+            text_color = self.__properties.text_colors[self.__state]
+            bk_color = self.__properties.bk_colors[self.__state]
+            border_color = self.__properties.border_colors[self.__state]
 
-            if bk_color[3]:
-                bg = pygame.Surface((self.__rect.width, self.__rect.height), pygame.SRCALPHA)
-                bg.fill(bk_color)
-                bg.set_alpha(bk_color[3], pygame.RLEACCEL)
-                self.__surface_to_draw.blit(bg, (0, 0))
-                del bg
+            self.__pygamecontrol.draw_background(self.__surface_to_draw, self.__properties, self.__state, bk_color,
+                                                 self.__rect)
 
             if text_color[3]:
                 text = self.__text_to_draw
@@ -1038,15 +2819,20 @@ class Label:
 
                 y_position += self.__y_offset
 
+                text_renderer = self.__text_renderer or self.__pygamecontrol.text_renderer
+                glyph_atlas = self.__pygamecontrol.glyph_atlas
+
                 for line in text:
                     amps = []
+                    # y_position is on the label's own surface, so it's checked against 0 and the height of the
+                    # rect and not against where the rect is
                     if TS_BOTTOM in self.__style:
                         # check that the y_position value is not above the top of the self.__rect
-                        if y_position + font_height < self.__rect.top:
+                        if y_position + font_height < 0:
                             y_position += font_height
                             continue
                     # if the y_position value + the current height needed to draw this line goes below the bottom
-                    elif y_position + font_height > self.__rect.bottom:
+                    elif y_position + font_height > self.__rect.height:
                         break
 
                     if TS_NOPREFIX not in self.__style:
@@ -1056,23 +2842,12 @@ class Label:
                             line = line[:index] + line[index + 1:]
 
                     # get the width of this line
-                    size = self.__font.pygame_font.size(line)
-
-                    string_surface = self.__font.pygame_font.render(line, True, text_color)
-
-                    for amp in amps:
-                        line_size = int(self.__font.font_size * 0.10)
-                        chr_width = self.__font.pygame_font.size(line[amp:amp + 1])[0]
-                        x_start = self.__font.pygame_font.size(line[:amp])[0]
-                        y_start = string_surface.get_height() - line_size
-                        pygame.draw.line(string_surface, text_color, (x_start, y_start),
-                                         (x_start + chr_width, y_start),
-                                         line_size)
-
-                    alpha_img = pygame.Surface(size, pygame.SRCALPHA)
-                    alpha_img.fill((255, 255, 255, text_color[3]))
-                    string_surface.blit(alpha_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-                    del alpha_img
+                    if text_renderer == 'atlas':
+                        glyphs, width = glyph_atlas.line_blits(self.__font, line, text_color)
+                        size = (width, font_height)
+                    else:
+                        string_surface = self.__pygamecontrol._render_line(self.__font, line, text_color, amps)
+                        size = string_surface.get_size()
 
                     if TS_HCENTER in self.__style and TS_LEFTNOWORDWRAP not in self.__style:
                         row_x = int((self.__client_rect.width / 2) - (size[0] / 2))
@@ -1084,18 +2859,679 @@ class Label:
                         row_x = 0
                     row_x += self.__x_offset
 
-                    self.__surface_to_draw.blit(string_surface, (row_x, y_position))
-                    self.__pygamecontrol.draw_style(self.__surface_to_draw, self.__properties, self.__style,
-                                                    bk_color, border_color, self.__rect)
+                    if text_renderer == 'atlas':
+                        glyph_atlas.draw(self.__surface_to_draw, glyphs, row_x, y_position)
+                        self.__pygamecontrol._draw_underlines(self.__surface_to_draw, self.__font, line, text_color,
+                                                              amps, row_x, y_position)
+                    else:
+                        self.__surface_to_draw.blit(string_surface, (row_x, y_position))
 
                     # adjust the y_position position
                     y_position += font_height
 
-        self.__surface.blit(self.__surface_to_draw, self.__rect)
-        return True
+            self.__pygamecontrol._draw_style_overlay(self.__surface_to_draw, self.__properties, self.__style,
+                                                     bk_color, border_color, self.__rect)
+
+            if self.__cache_states:
+                self.__pygamecontrol._state_cache.put(state_key, self.__surface_to_draw)
+
+        return self.__surface_to_draw, self.__rect
+
+
+class ControlGroup(object):
+    # draws a set of controls that share a surface, only redrawing the parts of the surface where a control
+    # changed, moved, was hidden or removed since the last draw
+    # background is a color or a pygame.Surface the size of the surface, it's drawn under the changed parts
+    # when None the changed parts are not cleared first
+    def __init__(self, pygamecontrol, surface, background=None):
+        if not isinstance(pygamecontrol, PyGameControls):
+            print('first argument, pygamecontrol, not a valid PyGameControls')
+            raise ValueError
+        if not isinstance(surface, pygame.Surface):
+            print('second argument, surface, not a valid pygame.Surface')
+            raise ValueError
+
+        self.__pygamecontrol = pygamecontrol
+        self.__surface = surface
+        self.__background = background
+        # controls in the order they are drawn, last one is on top
+        self.__controls = []
+        # control -> rect it was last drawn in
+        self.__drawn_rects = dict()
+        # areas that have to be redrawn no matter what the controls say, like where a removed control was
+        self.__invalid_rects = []
+
+    def add(self, *controls):
+        for control in controls:
+            if control.surface is not self.__surface:
+                print('control does not draw on the surface of this group')
+                raise ValueError
+            if control not in self.__drawn_rects:
+                self.__controls.append(control)
+                self.__drawn_rects[control] = None
+
+    def remove(self, *controls):
+        for control in controls:
+            if control in self.__drawn_rects:
+                self.__controls.remove(control)
+                rect = self.__drawn_rects.pop(control)
+                if rect:
+                    self.__invalid_rects.append(rect)
+
+    def invalidate(self, rect=None):
+        # redraw rect (or the whole surface) on the next draw, for example after drawing over the surface
+        self.__invalid_rects.append(pygame.Rect(rect) if rect else self.__surface.get_rect())
+
+    def draw(self):
+        # draws what changed and returns the changed rects, ready for pygame.display.update
+        dirty_rects = self.__invalid_rects
+        self.__invalid_rects = []
+
+        for control in self.__controls:
+            rect = control.draw_rect
+            drawn_rect = self.__drawn_rects[control]
+            if rect != drawn_rect or (rect and control.dirty):
+                if drawn_rect:
+                    dirty_rects.append(drawn_rect)
+                if rect:
+                    dirty_rects.append(rect)
+
+        if not dirty_rects:
+            return []
+
+        dirty_rects = self.__merge_rects(dirty_rects)
+        clip = self.__surface.get_clip()
+
+        for dirty_rect in dirty_rects:
+            self.__surface.set_clip(dirty_rect.clip(clip))
+            if isinstance(self.__background, pygame.Surface):
+                self.__surface.blit(self.__background, dirty_rect, dirty_rect)
+            elif self.__background is not None:
+                self.__surface.fill(self.__background, dirty_rect)
+
+            batch = []
+            for control in self.__controls:
+                rect = control.draw_rect
+                if rect and rect.colliderect(dirty_rect):
+                    prepared = control.prepare()
+                    if prepared:
+                        batch.append(prepared)
+            self.__surface.blits(batch, False)
+        self.__surface.set_clip(clip)
+
+        for control in self.__controls:
+            self.__drawn_rects[control] = control.draw_rect
+        return dirty_rects
+
+    @staticmethod
+    def __merge_rects(rects):
+        # overlapping rects are joined so nothing is drawn twice in one update
+        merged = []
+        for rect in rects:
+            rect = pygame.Rect(rect)
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    @property
+    def surface(self):
+        return self.__surface
+
+    @property
+    def controls(self):
+        return list(self.__controls)
+
+    @property
+    def background(self):
+        return self.__background
+
+    @background.setter
+    def background(self, background):
+        self.__background = background
+        self.invalidate()
+
+    def __len__(self):
+        return len(self.__controls)
+
+    def __contains__(self, control):
+        return control in self.__drawn_rects
+
+
+class ControlTable(object):
+    # many cells that look like Labels (or Pictures, with images) and only differ in position, text, image, color
+    # and state, kept in numpy arrays instead of a control per cell, for heatmaps, seat maps and tile grids
+    # properties is a ControlProperties or a list of them, colors picks the one each cell uses
+    # texts and images give each cell a text or an image (file, sprite path or pygame.Surface), None for neither,
+    # a cell with an image draws the image instead of its text
+    # the surface of each (size, properties, text, image, state) is made once and shared by every cell showing it
+    # through the PyGameControls state cache
+    # cells are anything numpy indexes with: an int, a slice, a list or array of indexes or a boolean mask
+    def __init__(self, pygamecontrol, surface, rects, properties, texts=None, colors=None, images=None,
+                 style=None, font=None, background=None):
+        if not isinstance(pygamecontrol, PyGameControls):
+            print('first argument, pygamecontrol, not a valid PyGameControls')
+            raise ValueError
+        if not isinstance(surface, pygame.Surface):
+            print('second argument, surface, not a valid pygame.Surface')
+            raise ValueError
+        if numpy is None:
+            print('ControlTable needs numpy')
+            raise ImportError
+
+        self.__pygamecontrol = pygamecontrol
+        self.__surface = surface
+        self.__background = background
+        # x, y, width, height of each cell
+        self.__rects = numpy.array(rects, dtype=numpy.int32).reshape(-1, 4)
+        # left, top, right and bottom of the cells one after the other for hit testing
+        self.__bounds = numpy.ascontiguousarray(numpy.concatenate((self.__rects[:, :2],
+                                                                   self.__rects[:, :2] + self.__rects[:, 2:]), 1).T)
+        count = len(self.__rects)
+        self.__states = numpy.full(count, STATE_NORMAL, numpy.int8)
+        self.__colors = numpy.zeros(count, numpy.int16)
+        # index in texts and images of what each cell shows, -1 for nothing
+        self.__text_ids = numpy.full(count, -1, numpy.int32)
+        self.__image_ids = numpy.full(count, -1, numpy.int32)
+        # cells that changed since they were last drawn
+        self.__changed = numpy.ones(count, numpy.bool_)
+        # what draw blitted last time and the font version it was made with, used again until a cell changes
+        self.__blits = None
+        self.__blits_font = None
+        self.__texts = []
+        self.__text_index = dict()
+        self.__images = []
+        self.__image_index = dict()
+        # images taken from the image cache, given back when the table is deleted
+        self.__cached_images = []
+        self.__properties = []
+        self.__token = pygamecontrol._control_token()
+        # bumped when the properties, font or style change, older state cache entries are never used again
+        self.__serial = 0
+        self.__style = pygamecontrol._check_style(style, [TS_LEFT, TS_TOP], None)
+        # one Label set to each cell whose surface is being made instead of a Label per cell
+        self.__stamp = Label(pygamecontrol, surface, '', 0, 0, 1, 1, self.__style, None, font)
+        self.properties = properties
+        if colors is not None:
+            self.set_color(slice(None), colors)
+        if texts is not None:
+            self.set_text(slice(None), texts)
+        if images is not None:
+            self.set_image(slice(None), images)
+
+    def __del__(self):
+        try:
+            image_cache = self.__pygamecontrol._image_cache
+            for image in self.__cached_images:
+                image_cache.release(image)
+        except AttributeError:
+            pass
+
+    @staticmethod
+    def grid(x, y, columns, rows, cell_width, cell_height, spacing=0):
+        # rects of a columns x rows grid of cells starting at x, y, row by row
+        if numpy is None:
+            print('ControlTable needs numpy')
+            raise ImportError
+        column, row = numpy.meshgrid(numpy.arange(columns), numpy.arange(rows))
+        rects = numpy.empty((rows * columns, 4), numpy.int32)
+        rects[:, 0] = x + column.ravel() * (cell_width + spacing)
+        rects[:, 1] = y + row.ravel() * (cell_height + spacing)
+        rects[:, 2] = cell_width
+        rects[:, 3] = cell_height
+        return rects
+
+    def __update(self, array, cells, values):
+        # sets array[cells] to values and marks the cells whose value changed
+        old = numpy.array(array[cells])
+        array[cells] = values
+        changed = array[cells] != old
+        if changed.any():
+            self.__changed[cells] |= changed
+            self.__blits = None
+
+    def set_state(self, cells, state):
+        if isinstance(state, str) or isinstance(state, float):
+            state = int(state)
+        state = numpy.asarray(state)
+        if (state < STATE_NORMAL).any() or (state > STATE_HIDDEN).any():
+            print('not a valid state for ControlTable,', state)
+            raise ValueError
+        self.__update(self.__states, cells, state)
+
+    def set_color(self, cells, colors):
+        # colors are indexes in properties
+        colors = numpy.asarray(colors)
+        if (colors < 0).any() or (colors >= len(self.__properties)).any():
+            print('color for ControlTable, not an index in properties,', colors)
+            raise ValueError
+        self.__update(self.__colors, cells, colors)
+
+    def set_text(self, cells, texts):
+        # a text for every cell or one per cell, numbers are shown as text, None or '' for no text
+        if texts is None or isinstance(texts, (str, int, float)):
+            ids = self.__text_id(texts)
+        else:
+            ids = numpy.array([self.__text_id(text) for text in texts], numpy.int32)
+        self.__update(self.__text_ids, cells, ids)
+
+    def set_image(self, cells, images):
+        # an image for every cell or one per cell, None for no image
+        if images is None or isinstance(images, (str, pygame.Surface)):
+            ids = self.__image_id(images)
+        else:
+            ids = numpy.array([self.__image_id(image) for image in images], numpy.int32)
+        self.__update(self.__image_ids, cells, ids)
+
+    def __text_id(self, text):
+        if text is None:
+            return -1
+        text = str(text)
+        if not text:
+            return -1
+        text_id = self.__text_index.get(text)
+        if text_id is None:
+            text_id = self.__text_index[text] = len(self.__texts)
+            self.__texts.append(text)
+        return text_id
+
+    def __image_id(self, image):
+        if image is None:
+            return -1
+        image_id = self.__image_index.get(image)
+        if image_id is None:
+            if isinstance(image, str):
+                image_cache = self.__pygamecontrol._image_cache
+                surface = image_cache.acquire(image) if image_cache.exists(image) else None
+                if not surface:
+                    print('error loading image:', image)
+                    raise ValueError
+                self.__cached_images.append(surface)
+            elif isinstance(image, pygame.Surface):
+                surface = image
+            else:
+                print('image for ControlTable, not a file or a pygame.Surface,', image)
+                raise ValueError
+            image_id = self.__image_index[image] = len(self.__images)
+            self.__images.append(surface)
+        return image_id
+
+    def cell_at(self, pos):
+        # topmost (last) cell under pos that isn't hidden or disabled, None when there's none
+        x, y = pos
+        left, top, right, bottom = self.__bounds
+        hits = (left <= x) & (x < right) & (top <= y) & (y < bottom) & (self.__states < STATE_DISABLED)
+        cells = numpy.flatnonzero(hits)
+        return int(cells[-1]) if len(cells) else None
+
+    def cells_in(self, rect):
+        # indexes of the cells colliding with rect, in drawing order
+        rect = pygame.Rect(rect)
+        left, top, right, bottom = self.__bounds
+        return numpy.flatnonzero((left < rect.right) & (rect.left < right) & (top < rect.bottom) & (rect.top < bottom))
+
+    def draw(self):
+        # draws every cell
+        if self.__blits is None or self.__blits_font != self.__stamp.font.version:
+            self.__blits = self.__blit_sequence(numpy.flatnonzero(self.__states != STATE_HIDDEN))
+            self.__blits_font = self.__stamp.font.version
+        self.__surface.blits(self.__blits, False)
+        self.__changed[:] = False
+
+    def update(self):
+        # draws the cells that changed since the last draw or update over the background and returns their rects,
+        # ready for pygame.display.update, cells aren't expected to overlap
+        cells = numpy.flatnonzero(self.__changed)
+        self.__changed[:] = False
+        rects = [pygame.Rect(rect) for rect in self.__rects[cells].tolist()]
+        if isinstance(self.__background, pygame.Surface):
+            self.__surface.blits([(self.__background, rect, rect) for rect in rects], False)
+        elif self.__background is not None:
+            for rect in rects:
+                self.__surface.fill(self.__background, rect)
+        self.__surface.blits(self.__blit_sequence(cells[self.__states[cells] != STATE_HIDDEN]), False)
+        return rects
+
+    def __blit_sequence(self, cells):
+        # [(surface, position)] of cells for Surface.blits
+        rects = self.__rects[cells]
+        drawable = (rects[:, 2] > 0) & (rects[:, 3] > 0)
+        cells = cells[drawable]
+        rects = rects[drawable]
+        if not len(cells):
+            return []
+
+        # every cell showing the same thing blits the same surface, cells are grouped by one number made out
+        # of everything that makes them look different, sorting rows of keys is much slower
+        columns = (rects[:, 2], rects[:, 3], self.__colors[cells], self.__text_ids[cells] + 1,
+                   self.__image_ids[cells] + 1, self.__states[cells])
+        try:
+            keys = numpy.ravel_multi_index(columns, [int(column.max()) + 1 for column in columns])
+            keys, first, inverse = numpy.unique(keys, return_index=True, return_inverse=True)
+        except ValueError:
+            # too many combinations to fit in one number
+            keys, first, inverse = numpy.unique(numpy.stack(columns, 1), axis=0, return_index=True,
+                                                return_inverse=True)
+        surfaces = [self.__cell_surface(*self.__key_of(cell)) for cell in cells[first].tolist()]
+        return [(surfaces[i], (x, y)) for i, x, y in zip(inverse.reshape(-1).tolist(), rects[:, 0].tolist(),
+                                                         rects[:, 1].tolist())]
+
+    def __key_of(self, cell):
+        return (int(self.__rects[cell, 2]), int(self.__rects[cell, 3]), int(self.__colors[cell]),
+                int(self.__text_ids[cell]), int(self.__image_ids[cell]), int(self.__states[cell]))
+
+    def __cell_surface(self, width, height, color, text_id, image_id, state):
+        # the font can be changed in place, its version is part of the key
+        key = (self.__token, self.__serial, self.__stamp.font.version, width, height, color, text_id, image_id,
+               state)
+        state_cache = self.__pygamecontrol._state_cache
+        surface = state_cache.get(key)
+        if surface:
+            return surface
+
+        properties = self.__properties[color]
+        if image_id >= 0:
+            rect = pygame.Rect(0, 0, width, height)
+            bk_color = properties.bk_colors[state]
+            surface = self.__pygamecontrol._scratch_surface(None, rect.size)
+            self.__pygamecontrol.draw_background(surface, properties, state, bk_color, rect)
+            image = self.__images[image_id]
+            surface.blit(image, image.get_rect(center=rect.center))
+            self.__pygamecontrol._draw_style_overlay(surface, properties, self.__style, bk_color,
+                                                     properties.border_colors[state], rect)
+        else:
+            stamp = self.__stamp
+            stamp.rect = pygame.Rect(0, 0, width, height)
+            stamp.properties = properties
+            stamp.text = self.__texts[text_id] if text_id >= 0 else ''
+            stamp.state = state
+            # the stamp draws into the same buffer every time
+            surface = stamp.prepare()[0].copy()
+        state_cache.put(key, surface)
+        return surface
+
+    @property
+    def surface(self):
+        return self.__surface
+
+    @property
+    def rects(self):
+        # the arrays are read only, change them with the set_ methods so changed cells get drawn again
+        return self.__read_only(self.__rects)
+
+    @property
+    def states(self):
+        return self.__read_only(self.__states)
+
+    @property
+    def colors(self):
+        return self.__read_only(self.__colors)
+
+    @property
+    def text_ids(self):
+        return self.__read_only(self.__text_ids)
+
+    @property
+    def image_ids(self):
+        return self.__read_only(self.__image_ids)
+
+    @staticmethod
+    def __read_only(array):
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def texts(self):
+        return list(self.__texts)
+
+    @property
+    def images(self):
+        return list(self.__images)
+
+    @property
+    def properties(self):
+        return list(self.__properties)
+
+    @property
+    def style(self):
+        return self.__style
+
+    @property
+    def font(self):
+        return self.__stamp.font
+
+    @property
+    def background(self):
+        return self.__background
+
+    @properties.setter
+    def properties(self, properties):
+        if isinstance(properties, ControlProperties):
+            properties = [properties]
+        if not properties or not all(isinstance(p, ControlProperties) for p in properties):
+            print('properties for ControlTable, not a ControlProperties or a list of them')
+            raise ValueError
+        if len(self.__colors) and self.__colors.max() >= len(properties):
+            print('properties for ControlTable, a cell uses a color past the end of properties')
+            raise ValueError
+        self.__properties = [self.__pygamecontrol.intern_properties(p) for p in properties]
+        self.__invalidate()
+
+    @style.setter
+    def style(self, style):
+        self.__style = self.__pygamecontrol._check_style(style, self.__style, None)
+        self.__stamp.style = self.__style
+        self.__invalidate()
+
+    @font.setter
+    def font(self, font):
+        if isinstance(font, Font):
+            self.__stamp.font = font
+            self.__invalidate()
+
+    @background.setter
+    def background(self, background):
+        self.__background = background
+        self.__changed[:] = True
+
+    def __invalidate(self):
+        # every cell looks different now
+        self.__serial += 1
+        self.__changed[:] = True
+        self.__blits = None
+
+    def __len__(self):
+        return len(self.__rects)
+
+
+class EventDispatcher(object):
+    # routes pygame mouse events to the controls under the cursor
+    # controls are kept in a uniform grid of cell_size pixel cells so a mouse event only looks at the controls
+    # in one cell, the grid is updated when a control moves or changes state
+    # handlers are called as handler(control, pgce_event, pos), the topmost (last added) control gets the event
+    # hot and pressed states are set on the controls as the mouse moves over them and clicks them
+    def __init__(self, pygamecontrol, cell_size=64, hover_time=400, double_click_time=500):
+        if not isinstance(pygamecontrol, PyGameControls):
+            print('first argument, pygamecontrol, not a valid PyGameControls')
+            raise ValueError
+
+        self.__pygamecontrol = pygamecontrol
+        self.__cell_size = max(int(cell_size), 1)
+        self.__hover_time = hover_time
+        self.__double_click_time = double_click_time
+        # (cell x, cell y) -> set of controls
+        self.__cells = dict()
+        # control -> [handler, order added, indexed rect, cells]
+        self.__controls = dict()
+        self.__order = 0
+        # controls that moved or changed state since they were last indexed
+        self.__moved = set()
+        self.__hot = None
+        self.__pressed = None
+        self.__mouse_pos = None
+        self.__last_move = 0
+        self.__hovered = False
+        # (control, button, time) of the last button down, used for double clicks
+        self.__last_click = None
+        pygamecontrol._control_listeners.add(self)
+
+    def add(self, control, handler=None):
+        if control in self.__controls:
+            self.__controls[control][0] = handler
+            return
+        self.__order += 1
+        self.__controls[control] = [handler, self.__order, None, ()]
+        self.__index(control)
+
+    def remove(self, control):
+        entry = self.__controls.pop(control, None)
+        if not entry:
+            return
+        for cell in entry[3]:
+            self.__cells[cell].discard(control)
+        self.__moved.discard(control)
+        if self.__hot is control:
+            self.__hot = None
+        if self.__pressed is control:
+            self.__pressed = None
+
+    def _control_moved(self, control):
+        if control in self.__controls:
+            self.__moved.add(control)
+
+    def __index(self, control):
+        entry = self.__controls[control]
+        rect = control.draw_rect
+        if rect == entry[2]:
+            return
+
+        for cell in entry[3]:
+            self.__cells[cell].discard(control)
+
+        cells = []
+        if rect and rect.width > 0 and rect.height > 0:
+            size = self.__cell_size
+            for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+                for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    cell = (cell_x, cell_y)
+                    controls = self.__cells.get(cell)
+                    if controls is None:
+                        controls = self.__cells[cell] = set()
+                    controls.add(control)
+                    cells.append(cell)
+        entry[2] = rect
+        entry[3] = cells
+
+    def control_at(self, pos):
+        # topmost control under pos that can receive mouse events
+        while self.__moved:
+            self.__index(self.__moved.pop())
+
+        top = None
+        top_order = 0
+        size = self.__cell_size
+        for control in self.__cells.get((int(pos[0]) // size, int(pos[1]) // size), ()):
+            entry = self.__controls[control]
+            if entry[1] > top_order and control.state != STATE_DISABLED and entry[2].collidepoint(pos):
+                top = control
+                top_order = entry[1]
+        return top
+
+    def dispatch(self, event):
+        # handles a pygame event, returns the [(control, pgce_event)] that were sent
+        sent = []
+        if event.type == pygame.MOUSEMOTION:
+            self.__mouse_pos = event.pos
+            self.__last_move = pygame.time.get_ticks()
+            self.__hovered = False
+            self.__set_hot(self.control_at(event.pos), event.pos, sent)
+            target = self.__pressed or self.__hot
+            if target:
+                self.__send(target, PGCE_MOUSEMOVE, event.pos, sent)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button in MOUSE_BUTTON_EVENTS:
+            target = self.control_at(event.pos)
+            self.__set_hot(target, event.pos, sent)
+            if target:
+                now = pygame.time.get_ticks()
+                down, up, double_click = MOUSE_BUTTON_EVENTS[event.button]
+                last_click = self.__last_click
+                if last_click and last_click[0] is target and last_click[1] == event.button \
+                        and now - last_click[2] <= self.__double_click_time:
+                    self.__last_click = None
+                    self.__send(target, double_click, event.pos, sent)
+                else:
+                    self.__last_click = (target, event.button, now)
+                    self.__send(target, down, event.pos, sent)
+                if event.button == 1:
+                    self.__pressed = target
+                    target.state = STATE_PRESSED
+        elif event.type == pygame.MOUSEBUTTONUP and event.button in MOUSE_BUTTON_EVENTS:
+            target = self.control_at(event.pos)
+            up = MOUSE_BUTTON_EVENTS[event.button][1]
+            if event.button == 1 and self.__pressed:
+                # the control that got the button down gets the button up, even if the mouse left it
+                pressed = self.__pressed
+                self.__pressed = None
+                if pressed.state == STATE_PRESSED:
+                    pressed.state = STATE_HOT if pressed is target else STATE_NORMAL
+                self.__send(pressed, up, event.pos, sent)
+            elif target:
+                self.__send(target, up, event.pos, sent)
+            self.__set_hot(target, event.pos, sent)
+        return sent
+
+    def update(self):
+        # call once a frame, sends PGCE_MOUSEHOVER when the mouse rests on a control for hover_time ms
+        sent = []
+        if self.__hot and not self.__hovered \
+                and pygame.time.get_ticks() - self.__last_move >= self.__hover_time:
+            self.__hovered = True
+            self.__send(self.__hot, PGCE_MOUSEHOVER, self.__mouse_pos, sent)
+        return sent
+
+    def __set_hot(self, control, pos, sent):
+        if control is self.__hot:
+            return
+        hot = self.__hot
+        self.__hot = control
+        self.__hovered = False
+        if hot:
+            if hot.state == STATE_HOT:
+                hot.state = STATE_NORMAL
+            self.__send(hot, PGCE_MOUSELEAVE, pos, sent)
+        if control:
+            if control.state == STATE_NORMAL:
+                control.state = STATE_HOT
+            self.__send(control, PGCE_MOUSEENTER, pos, sent)
+
+    def __send(self, control, pgce_event, pos, sent):
+        sent.append((control, pgce_event))
+        entry = self.__controls.get(control)
+        if entry and entry[0]:
+            entry[0](control, pgce_event, pos)
+
+    @property
+    def hot(self):
+        return self.__hot
+
+    @property
+    def pressed(self):
+        return self.__pressed
+
+    def __len__(self):
+        return len(self.__controls)
+
+    def __contains__(self, control):
+        return control in self.__controls
 
 
 class Font:
+    __slots__ = ('__font_file', '__family_name', '__family_key', '__font_size', '__attribute', '__pygame_font',
+                 '__pool_key', '__pygamecontrol', '__version', '__weakref__')
+
     def __init__(self, pygamecontrol, family_name=None, font_size=None, attribute=None):
         if not isinstance(pygamecontrol, PyGameControls):
             print('error with first parameter, pygamecontrol, is not a PyGameControls')
@@ -1107,7 +3543,10 @@ class Font:
         self.__font_size = None
         self.__attribute = None
         self.__pygame_font = None
+        self.__pool_key = None
         self.__pygamecontrol = pygamecontrol
+        # bumped every time the font changes, controls compare it with the version they were laid out with
+        self.__version = 0
 
         if not family_name:
             family_name = pygamecontrol._default_font
@@ -1151,7 +3590,35 @@ class Font:
         if self.__font_size != font_size:
             self.__font_size = font_size
 
-        self.__pygame_font = pygame.font.Font(self.__font_file, self.__font_size)
+        # pygame fonts are shared through the pool, give the old one back before taking the new one
+        pool = self.__pygamecontrol._font_pool
+        if self.__pygame_font:
+            pool.release(self.__pool_key[0], self.__pool_key[1])
+        self.__pool_key = (self.__font_file, self.__font_size)
+        self.__pygame_font = pool.acquire(self.__font_file, self.__font_size)
+        self.__version += 1
+
+    def __copy__(self):
+        font = Font.__new__(Font)
+        font.__font_file = self.__font_file
+        font.__family_name = self.__family_name
+        font.__family_key = self.__family_key
+        font.__font_size = self.__font_size
+        font.__attribute = self.__attribute
+        font.__pygame_font = self.__pygame_font
+        font.__pool_key = self.__pool_key
+        font.__pygamecontrol = self.__pygamecontrol
+        font.__version = self.__version
+        if font.__pygame_font:
+            font.__pygame_font = font.__pygamecontrol._font_pool.acquire(font.__pool_key[0], font.__pool_key[1])
+        return font
+
+    def __del__(self):
+        try:
+            if self.__pygame_font:
+                self.__pygamecontrol._font_pool.release(self.__pool_key[0], self.__pool_key[1])
+        except AttributeError:
+            pass
 
     @property
     def font_file(self):
@@ -1173,6 +3640,10 @@ class Font:
     def pygame_font(self):
         return self.__pygame_font
 
+    @property
+    def version(self):
+        return self.__version
+
     @family_name.setter
     def family_name(self, family_name):
         self.__make_font(family_name, self.__font_size, self.__attribute)
@@ -1191,6 +3662,22 @@ class Font:
 
 
 class ControlProperties:
+    # colors, borders and gradients of a control, immutable so the same instance can be shared by any number of
+    # controls and used as a cache key, compares and hashes by value
+    # use replace for a copy with some values changed and PyGameControls.intern_properties to share one instance
+    # between every control with the same values
+    # the colors and gradients of the states are kept as tuples indexed by state
+    __slots__ = ('__control_type', '__style', '__bk_colors', '__text_colors', '__px_border', '__border_colors',
+                 '__gradient_type', '__gradient_angle', '__gradients', '__key', '__hash', '__weakref__')
+
+    __fields = ('control_type', 'style', 'bk_color_normal', 'text_color_normal',
+                'bk_color_hot', 'text_color_hot', 'bk_color_pressed', 'text_color_pressed',
+                'bk_color_focused', 'text_color_focused', 'bk_color_disabled', 'text_color_disabled',
+                'px_border', 'border_color_normal', 'border_color_hot', 'border_color_pressed',
+                'border_color_focused', 'border_color_disabled', 'gradient_type', 'gradient_angle',
+                'gradient_normal', 'gradient_hot', 'gradient_pressed', 'gradient_focused',
+                'gradient_disabled')
+
     def __init__(self, control_type, style='flat',
                  bk_color_normal=None, text_color_normal=None,
                  bk_color_hot=None, text_color_hot=None,
@@ -1202,7 +3689,13 @@ class ControlProperties:
                  border_color_hot=None,
                  border_color_pressed=None,
                  border_color_focused=None,
-                 border_color_disabled=None):
+                 border_color_disabled=None,
+                 gradient_type='linear', gradient_angle=90,
+                 gradient_normal=None,
+                 gradient_hot=None,
+                 gradient_pressed=None,
+                 gradient_focused=None,
+                 gradient_disabled=None):
         if control_type not in SUPPORTED_CONTROLS:
             print('first argument for ControlProperties, control_type, not a supported control,', control_type)
             raise ValueError
@@ -1216,23 +3709,110 @@ class ControlProperties:
             raise ValueError
 
         self.__style = style
-        self.__bk_color_normal = self.__proper_rgba(bk_color_normal, (0, 0, 0, 0))
-        self.__text_color_normal = self.__proper_rgba(text_color_normal, (0, 0, 0, 255))
-        self.__bk_color_hot = self.__proper_rgba(bk_color_hot, self.__bk_color_normal)
-        self.__text_color_hot = self.__proper_rgba(text_color_hot, self.__text_color_normal)
-        self.__bk_color_pressed = self.__proper_rgba(bk_color_pressed, self.__bk_color_normal)
-        self.__text_color_pressed = self.__proper_rgba(text_color_pressed, self.__text_color_normal)
-        self.__bk_color_focused = self.__proper_rgba(bk_color_focused, self.__bk_color_normal)
-        self.__text_color_focused = self.__proper_rgba(text_color_focused, self.__text_color_normal)
-        self.__bk_color_disabled = self.__proper_rgba(bk_color_disabled, self.__bk_color_normal)
-        self.__text_color_disabled = self.__proper_rgba(text_color_disabled, self.__text_color_normal)
-        self.__border_color_normal = self.__proper_rgba(border_color_normal, (0, 0, 0, 0))
-        self.__border_color_hot = self.__proper_rgba(border_color_hot, self.__border_color_normal)
-        self.__border_color_pressed = self.__proper_rgba(border_color_pressed, self.__border_color_normal)
-        self.__border_color_focused = self.__proper_rgba(border_color_focused, self.__border_color_normal)
-        self.__border_color_disabled = self.__proper_rgba(border_color_disabled, self.__border_color_normal)
+        bk_color_normal = self.__proper_rgba(bk_color_normal, (0, 0, 0, 0))
+        text_color_normal = self.__proper_rgba(text_color_normal, (0, 0, 0, 255))
+        border_color_normal = self.__proper_rgba(border_color_normal, (0, 0, 0, 0))
+        self.__bk_colors = (bk_color_normal,
+                            self.__proper_rgba(bk_color_hot, bk_color_normal),
+                            self.__proper_rgba(bk_color_pressed, bk_color_normal),
+                            self.__proper_rgba(bk_color_focused, bk_color_normal),
+                            self.__proper_rgba(bk_color_disabled, bk_color_normal))
+        self.__text_colors = (text_color_normal,
+                              self.__proper_rgba(text_color_hot, text_color_normal),
+                              self.__proper_rgba(text_color_pressed, text_color_normal),
+                              self.__proper_rgba(text_color_focused, text_color_normal),
+                              self.__proper_rgba(text_color_disabled, text_color_normal))
+        self.__border_colors = (border_color_normal,
+                                self.__proper_rgba(border_color_hot, border_color_normal),
+                                self.__proper_rgba(border_color_pressed, border_color_normal),
+                                self.__proper_rgba(border_color_focused, border_color_normal),
+                                self.__proper_rgba(border_color_disabled, border_color_normal))
         self.__px_border = px_border if px_border >= 1 else 0
 
+        if gradient_type not in SUPPORTED_GRADIENTS:
+            print('gradient_type for ControlProperties, not a supported gradient,', gradient_type)
+            raise ValueError
+        self.__gradient_type = gradient_type
+        self.__gradient_angle = gradient_angle
+        # stops left as None follow the background color of their state
+        gradients = (self.__proper_stops(gradient_normal),
+                     self.__proper_stops(gradient_hot),
+                     self.__proper_stops(gradient_pressed),
+                     self.__proper_stops(gradient_focused),
+                     self.__proper_stops(gradient_disabled))
+        # most properties have no gradients, they all share the same constant tuple
+        self.__gradients = gradients if any(gradients) else (None, None, None, None, None)
+
+        self.__key = (self.__control_type, self.__style, self.__bk_colors, self.__text_colors, self.__px_border,
+                      self.__border_colors, self.__gradient_type, self.__gradient_angle, self.__gradients)
+        self.__hash = hash(self.__key)
+
+    def __values(self):
+        # the values in the order of __fields
+        values = [self.__control_type, self.__style]
+        for bk_color, text_color in zip(self.__bk_colors, self.__text_colors):
+            values += [bk_color, text_color]
+        values.append(self.__px_border)
+        values += self.__border_colors
+        values += [self.__gradient_type, self.__gradient_angle]
+        values += self.__gradients
+        return values
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, ControlProperties):
+            return NotImplemented
+        return self.__hash == other.__hash and self.__key == other.__key
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return self.__hash
+
+    def __repr__(self):
+        return 'ControlProperties(%s)' % ', '.join('%s=%r' % item for item in zip(self.__fields, self.__values()))
+
+    def replace(self, **changes):
+        # a new ControlProperties with changes applied, a state color that defaulted to the normal one keeps the
+        # value it had, it doesn't follow a changed normal color
+        for name in changes:
+            if name not in self.__fields:
+                print('replace for ControlProperties, not a property,', name)
+                raise ValueError
+        values = dict(zip(self.__fields, self.__values()))
+        values.update(changes)
+        return ControlProperties(**values)
+
+    @property
+    def _key(self):
+        return self.__key
+
+    def __proper_stops(self, stops):
+        # ((position, rgba), ...) sorted by position from a list of colors spread evenly or (position, color) pairs
+        if not stops:
+            return None
+        stops = list(stops)
+        if all(isinstance(stop, tuple) and len(stop) == 2 and isinstance(stop[1], tuple) for stop in stops):
+            stops = [(min(max(float(position), 0.0), 1.0), self.__proper_rgba(color, (0, 0, 0, 255)))
+                     for position, color in stops]
+            return tuple(sorted(stops, key=lambda stop: stop[0]))
+        if len(stops) == 1:
+            stops.append(stops[0])
+        return tuple((i / (len(stops) - 1), self.__proper_rgba(color, (0, 0, 0, 255)))
+                     for i, color in enumerate(stops))
+
+    def gradient_stops(self, state):
+        # the gradient of state, without stops of its own a gradient from a lighter shade of the background color
+        stops = self.__gradients[state]
+        if stops:
+            return stops
+        bk_color = self.__bk_colors[state]
+        light = tuple(c + (255 - c) * 2 // 5 for c in bk_color[:3]) + (bk_color[3],)
+        return (0.0, light), (1.0, bk_color)
+
     def __proper_rgba(self, color, default):
         if not isinstance(color, tuple):
             return default
@@ -1247,10 +3827,7 @@ class ControlProperties:
         else:
             color = tuple(list(color)[:4])
 
-        for i in range(4):
-            if color[i] < 0 or color[i] > 255:
-                color[i] = default[i]
-        return color
+        return tuple(color[i] if 0 <= color[i] <= 255 else default[i] for i in range(4))
 
     @property
     def control_type(self):
@@ -1262,43 +3839,56 @@ class ControlProperties:
 
     @property
     def bk_color_normal(self):
-        return self.__bk_color_normal
+        return self.__bk_colors[STATE_NORMAL]
 
     @property
     def text_color_normal(self):
-        return self.__text_color_normal
+        return self.__text_colors[STATE_NORMAL]
 
     @property
     def bk_color_hot(self):
-        return self.__bk_color_hot
+        return self.__bk_colors[STATE_HOT]
 
     @property
     def text_color_hot(self):
-        return self.__text_color_hot
+        return self.__text_colors[STATE_HOT]
 
     @property
     def bk_color_pressed(self):
-        return self.__bk_color_pressed
+        return self.__bk_colors[STATE_PRESSED]
 
     @property
     def text_color_pressed(self):
-        return self.__text_color_pressed
+        return self.__text_colors[STATE_PRESSED]
 
     @property
     def bk_color_focused(self):
-        return self.__bk_color_focused
+        return self.__bk_colors[STATE_FOCUSED]
 
     @property
     def text_color_focused(self):
-        return self.__text_color_focused
+        return self.__text_colors[STATE_FOCUSED]
 
     @property
     def bk_color_disabled(self):
-        return self.__bk_color_disabled
+        return self.__bk_colors[STATE_DISABLED]
 
     @property
     def text_color_disabled(self):
-        return self.__text_color_disabled
+        return self.__text_colors[STATE_DISABLED]
+
+    @property
+    def bk_colors(self):
+        # background color of each state, indexed by state
+        return self.__bk_colors
+
+    @property
+    def text_colors(self):
+        return self.__text_colors
+
+    @property
+    def border_colors(self):
+        return self.__border_colors
 
     @property
     def px_border(self):
@@ -1306,89 +3896,48 @@ class ControlProperties:
 
     @property
     def border_color_normal(self):
-        return self.__border_color_normal
+        return self.__border_colors[STATE_NORMAL]
 
     @property
     def border_color_hot(self):
-        return self.__border_color_hot
+        return self.__border_colors[STATE_HOT]
 
     @property
     def border_color_pressed(self):
-        return self.__border_color_pressed
+        return self.__border_colors[STATE_PRESSED]
 
     @property
     def border_color_focused(self):
-        return self.__border_color_focused
+        return self.__border_colors[STATE_FOCUSED]
 
     @property
     def border_color_disabled(self):
-        return self.__border_color_disabled
-
-    @style.setter
-    def style(self, style):
-        if style in SUPPORTED_CONTROL_STYLES:
-            self.__style = style
-
-    @bk_color_normal.setter
-    def bk_color_normal(self, bk_color_normal):
-        self.__bk_color_normal = self.__proper_rgba(bk_color_normal, self.__bk_color_normal)
+        return self.__border_colors[STATE_DISABLED]
 
-    @text_color_normal.setter
-    def text_color_normal(self, text_color_normal):
-        self.__text_color_normal = self.__proper_rgba(text_color_normal, self.__text_color_normal)
-
-    @bk_color_hot.setter
-    def bk_color_hot(self, bk_color_hot):
-        self.__bk_color_hot = self.__proper_rgba(bk_color_hot, self.__bk_color_hot)
-
-    @text_color_hot.setter
-    def text_color_hot(self, text_color_hot):
-        self.__text_color_hot = self.__proper_rgba(text_color_hot, self.__text_color_hot)
-
-    @bk_color_pressed.setter
-    def bk_color_pressed(self, bk_color_pressed):
-        self.__bk_color_pressed = self.__proper_rgba(bk_color_pressed, self.__bk_color_pressed)
-
-    @text_color_pressed.setter
-    def text_color_pressed(self, text_color_pressed):
-        self.__text_color_pressed = self.__proper_rgba(text_color_pressed, self.__text_color_pressed)
-
-    @bk_color_focused.setter
-    def bk_color_focused(self, bk_color_focused):
-        self.__bk_color_focused = self.__proper_rgba(bk_color_focused, self.__bk_color_focused)
-
-    @text_color_focused.setter
-    def text_color_focused(self, text_color_focused):
-        self.__text_color_focused = self.__proper_rgba(text_color_focused, self.__text_color_focused)
-
-    @bk_color_disabled.setter
-    def bk_color_disabled(self, bk_color_disabled):
-        self.__bk_color_disabled = self.__proper_rgba(bk_color_disabled, self.__bk_color_disabled)
-
-    @text_color_disabled.setter
-    def text_color_disabled(self, text_color_disabled):
-        self.__text_color_disabled = self.__proper_rgba(text_color_disabled, self.__text_color_disabled)
+    @property
+    def gradient_type(self):
+        return self.__gradient_type
 
-    @px_border.setter
-    def px_border(self, px_border):
-        self.__px_border = px_border
+    @property
+    def gradient_angle(self):
+        return self.__gradient_angle
 
-    @border_color_normal.setter
-    def border_color_normal(self, border_color_normal):
-        self.__border_color_normal = self.__proper_rgba(border_color_normal, self.__border_color_normal)
+    @property
+    def gradient_normal(self):
+        return self.__gradients[STATE_NORMAL]
 
-    @border_color_hot.setter
-    def border_color_hot(self, border_color_hot):
-        self.__border_color_hot = self.__proper_rgba(border_color_hot, self.__border_color_hot)
+    @property
+    def gradient_hot(self):
+        return self.__gradients[STATE_HOT]
 
-    @border_color_pressed.setter
-    def border_color_pressed(self, border_color_pressed):
-        self.__border_color_pressed = self.__proper_rgba(border_color_pressed, self.__border_color_pressed)
+    @property
+    def gradient_pressed(self):
+        return self.__gradients[STATE_PRESSED]
 
-    @border_color_focused.setter
-    def border_color_focused(self, border_color_focused):
-        self.__border_color_focused = self.__proper_rgba(border_color_focused, self.__border_color_focused)
+    @property
+    def gradient_focused(self):
+        return self.__gradients[STATE_FOCUSED]
 
-    @border_color_disabled.setter
-    def border_color_disabled(self, border_color_disabled):
-        self.__border_color_disabled = self.__proper_rgba(border_color_disabled, self.__border_color_disabled)
\ No newline at end of file
+    @property
+    def gradient_disabled(self):
+        return self.__gradients[STATE_DISABLED]